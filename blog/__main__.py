@@ -23,7 +23,7 @@ from sys import argv, exit, stderr
 from RestOC import Record_MySQL
 
 # Module imports
-from blog import install, rest
+from blog import install, rest, thumbnails
 
 def cli():
 	"""CLI
@@ -85,6 +85,10 @@ def cli():
 		elif argv[1] == 'rest':
 			return rest.run()
 
+		# Else, if we are running the thumbnail worker
+		elif argv[1] == 'thumbnails':
+			return thumbnails.run()
+
 		# Else, if we are upgrading
 		elif argv[1] == 'upgrade':
 			return upgrade(dConfig['data'], dConfig['module'])
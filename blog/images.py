@@ -0,0 +1,309 @@
+# coding=utf8
+""" Images
+
+Image helpers that work on a single decoded copy of the source rather \
+than re-decoding the raw bytes for every operation
+"""
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__version__		= "1.0.0"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-08-29"
+
+# Ouroboros imports
+from tools import crop as crop_tool, fit as fit_tool
+
+# Python imports
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from os import cpu_count
+from struct import unpack
+from typing import Iterator, List
+
+# Pip imports
+from PIL import Image as Pillow
+
+# exif rotation tag
+ORIENTATION_TAG = 0x0112
+
+# Rotation sequences based on exif orientation flag
+SEQUENCES = [
+	[],
+	[Pillow.FLIP_LEFT_RIGHT],
+	[Pillow.ROTATE_180],
+	[Pillow.FLIP_TOP_BOTTOM],
+	[Pillow.FLIP_LEFT_RIGHT, Pillow.ROTATE_90],
+	[Pillow.ROTATE_270],
+	[Pillow.FLIP_TOP_BOTTOM, Pillow.ROTATE_90],
+	[Pillow.ROTATE_90]
+]
+
+# Shared pool for data-parallel resizes, Pillow releases the GIL inside its
+#	C resize and encode paths so threads use the available cores
+_resize_pool = ThreadPoolExecutor(max_workers = cpu_count() or 1)
+
+def info_quick(image: bytes) -> dict:
+	"""Info Quick
+
+	Returns the length, mime, and resolution of an image by reading just \
+	the header bytes for the formats uploads support, falling back to a \
+	Pillow open for anything else
+
+	Arguments:
+		image (bytes): Raw image data
+
+	Returns:
+		dict
+	"""
+
+	# JPEG, walk the marker segments to the frame header
+	if image[:3] == b'\xff\xd8\xff':
+		i = 2
+		iEnd = len(image) - 9
+		while i < iEnd:
+
+			# Markers can be preceded by fill bytes
+			if image[i] != 0xFF:
+				i += 1
+				continue
+
+			# Get the marker
+			iMarker = image[i + 1]
+
+			# Standalone markers carry no length
+			if iMarker in (0x01, 0xD8) or 0xD0 <= iMarker <= 0xD7:
+				i += 2
+				continue
+
+			# Start of frame, any variant except the huffman / arithmetic
+			#	tables that share the range, holds the dimensions
+			if 0xC0 <= iMarker <= 0xCF and \
+				iMarker not in (0xC4, 0xC8, 0xCC):
+				iHeight, iWidth = unpack('>HH', image[i + 5:i + 9])
+				return {
+					'length': len(image),
+					'mime': 'image/jpeg',
+					'resolution': { 'width': iWidth, 'height': iHeight }
+				}
+
+			# Skip the rest of the segment using its length
+			i += 2 + unpack('>H', image[i + 2:i + 4])[0]
+
+	# PNG, the IHDR chunk is always first so the dimensions sit at a fixed
+	#	offset
+	elif image[:8] == b'\x89PNG\r\n\x1a\n' and len(image) >= 24:
+		iWidth, iHeight = unpack('>II', image[16:24])
+		return {
+			'length': len(image),
+			'mime': 'image/png',
+			'resolution': { 'width': iWidth, 'height': iHeight }
+		}
+
+	# Anything else, let Pillow parse the header, open() doesn't decode the
+	#	pixel data
+	oImg = Pillow.open(BytesIO(image))
+	dRet = {
+		'length': len(image),
+		'mime': oImg.format in Pillow.MIME and Pillow.MIME[oImg.format] or \
+			None,
+		'resolution': { 'width': oImg.size[0], 'height': oImg.size[1] }
+	}
+	oImg.close()
+
+	# Return the info
+	return dRet
+
+def resize_iter(image: bytes, specs: List[str], ahead: int = 4) -> Iterator:
+	"""Resize Iter
+
+	Decodes the source image once and yields a (spec, bytes) pair per \
+	requested spec as each finishes. At most `ahead` resizes run in the \
+	pool beyond what the caller has consumed, so peak memory stays \
+	bounded by the window instead of growing with the number of specs
+
+	Arguments:
+		image (bytes): Raw image data to be loaded and resized
+		specs (str[]): The list of thumbnail specs to generate
+		ahead (uint): Maximum resizes in flight beyond the one yielded
+
+	Returns:
+		Iterator
+	"""
+
+	# Decode and prep the source once
+	oImg, sFormat = _prepare(image, specs)
+
+	# Pending (spec, future) pairs, in order
+	lPending = []
+	i = 0
+
+	try:
+
+		# As long as there's specs to submit or results to drain
+		while i < len(specs) or lPending:
+
+			# Top the window up
+			while i < len(specs) and len(lPending) < ahead:
+				lPending.append((
+					specs[i],
+					_resize_pool.submit(_resize_one, oImg, sFormat, specs[i])
+				))
+				i += 1
+
+			# Hand back the oldest result, blocking until it's done
+			s, oFuture = lPending.pop(0)
+			yield s, oFuture.result()
+
+	# However we leave, drop whatever hasn't started and free the source
+	finally:
+		for s, oFuture in lPending:
+			oFuture.cancel()
+		oImg.close()
+
+def resize_many(image: bytes, specs: List[str]) -> dict:
+	"""Resize Many
+
+	Decodes the source image once and generates a resized copy of it for \
+	each requested spec. Specs use the thumbnail format from the media \
+	definition, a 'c' (crop) or 'f' (fit) followed by the dimensions, \
+	e.g. 'c300x200'
+
+	Arguments:
+		image (bytes): Raw image data to be loaded and resized
+		specs (str[]): The list of thumbnail specs to generate
+
+	Returns:
+		dict
+	"""
+
+	# Decode and prep the source once
+	oImg, sFormat = _prepare(image, specs)
+
+	# Init the return
+	dRet = {}
+
+	# If there's just one spec, skip the pool overhead
+	if len(specs) == 1:
+		dRet[specs[0]] = _resize_one(oImg, sFormat, specs[0])
+
+	# Else, fan the specs out across the pool, each task copies the decoded
+	#	source so they're independent of each other
+	else:
+		for s, oFuture in [
+			(s, _resize_pool.submit(_resize_one, oImg, sFormat, s)) \
+			for s in specs
+		]:
+			dRet[s] = oFuture.result()
+
+	# Cleanup
+	oImg.close()
+
+	# Return the resized images by spec
+	return dRet
+
+def _prepare(image: bytes, specs: List[str]) -> tuple:
+	"""Prepare (Protected)
+
+	Decodes the source image, reduces the JPEG decode scale where the \
+	requested sizes allow it, and corrects the exif orientation, \
+	returning the loaded image and its original format
+
+	Arguments:
+		image (bytes): Raw image data to be loaded
+		specs (str[]): The list of thumbnail specs it will be resized to
+
+	Returns:
+		tuple
+	"""
+
+	# Load the source into Pillow once
+	oImg = Pillow.open(BytesIO(image))
+
+	# Store the format
+	sFormat = oImg.format
+
+	# If the source is a JPEG, let libjpeg decode at a reduced scale when
+	#	every requested size is far smaller than the source. draft() never
+	#	goes below the size it's given, so doubling the largest request
+	#	leaves plenty of pixels for the LANCZOS pass. Must happen before
+	#	anything touches the pixel data
+	if sFormat == 'JPEG':
+		iMaxW = 0
+		iMaxH = 0
+		for s in specs:
+			lDims = s[1:].split('x')
+			if int(lDims[0]) > iMaxW:
+				iMaxW = int(lDims[0])
+			if int(lDims[1]) > iMaxH:
+				iMaxH = int(lDims[1])
+		oImg.draft(None, (iMaxW * 2, iMaxH * 2))
+
+	# If the image has an orientation, fix it once rather than per spec
+	try:
+		lSeq = SEQUENCES[oImg._getexif()[ORIENTATION_TAG] - 1]
+		for i in lSeq:
+			oImg = oImg.transpose(i)
+	except Exception:
+		pass
+
+	# Force the pixel data to load now, the resize tasks read it from
+	#	multiple threads and lazy loading isn't safe concurrently
+	oImg.load()
+
+	# Return the decoded image and its format
+	return oImg, sFormat
+
+def _resize_one(image, format: str, spec: str) -> bytes:
+	"""Resize One (Protected)
+
+	Generates a single resized copy of an already decoded, orientation \
+	corrected source image
+
+	Arguments:
+		image (PIL.Image): The decoded source
+		format (str): The format to encode the result in
+		spec (str): The thumbnail spec to generate
+
+	Returns:
+		bytes
+	"""
+
+	# Get the type and dimensions
+	bCrop = spec[0] == 'c'
+	lDims = spec[1:].split('x')
+	iWidth = int(lDims[0])
+	iHeight = int(lDims[1])
+
+	# Create a new blank canvas
+	oNewImg = Pillow.new(image.mode, [iWidth, iHeight], (255,255,255,255))
+
+	# Figure out the dimensions that keep the aspect ratio
+	if bCrop:
+		dResize = crop_tool(image.width, image.height, iWidth, iHeight)
+	else:
+		dResize = fit_tool(image.width, image.height, iWidth, iHeight)
+
+	# Resize a copy so the decoded source stays pristine for the other
+	#	specs
+	oCopy = image.copy()
+	oCopy.thumbnail([dResize['w'], dResize['h']], Pillow.ANTIALIAS)
+
+	# Paste the resized copy onto the canvas, centered
+	oNewImg.paste(oCopy, (
+		(iWidth - dResize['w']) // 2,
+		(iHeight - dResize['h']) // 2
+	))
+
+	# Save the new image to raw bytes
+	sNewImg = BytesIO(b'')
+	oNewImg.save(sNewImg, format, quality = 90, subsampling = 0)
+	sRet = sNewImg.getvalue()
+
+	# Cleanup
+	oNewImg.close()
+	oCopy.close()
+	sNewImg.close()
+
+	# Return the resized image
+	return sRet
@@ -16,11 +16,15 @@ __all__ = [ 'MediaStorage' ]
 from config import config
 
 # Python modules
+from functools import lru_cache
+from io import BytesIO
 from time import sleep
+from typing import Iterator, List
 from urllib import parse
 
 # Import pip modules
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.client import Config as BotoConfig
 from botocore.exceptions import ClientError
 from botocore.vendored.requests.packages.urllib3.exceptions import \
@@ -29,6 +33,10 @@ from botocore.vendored.requests.packages.urllib3.exceptions import \
 # Local modules
 from . import BaseMediaStorage
 
+# Files at or above this size go through the transfer manager as concurrent
+#	multipart uploads, anything smaller sticks to a single put
+_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+
 class __S3Storage(BaseMediaStorage):
 	"""S3 Storage
 
@@ -67,20 +75,26 @@ class __S3Storage(BaseMediaStorage):
 		# Create a new session using the profile given
 		self._session = boto3.Session(profile_name = dConf['profile'])
 
-		# Get an S3 resource using the session
-		self._resource = self._session.resource(
-			's3', config = BotoConfig(**dConf['settings'])
-		)
-
-		# Get a client using the session
+		# Get a client using the session. Everything goes through the
+		#	client, it's the only boto3 interface documented as thread safe
+		#	and the storage calls run concurrently from the service's pools
 		self._client = self._session.client(
 			's3',
-			config = boto3.session.Config(
+			config = BotoConfig(
 				s3 = { 'addressing_style': 'path' },
-				signature_version = 's3v4'
+				signature_version = 's3v4',
+				**dConf['settings']
 			)
 		)
 
+		# Transfer settings for large saves, built once since they never
+		#	change
+		self._transfer = TransferConfig(
+			multipart_threshold = _MULTIPART_THRESHOLD,
+			max_concurrency = 4,
+			use_threads = True
+		)
+
 	def delete(self, filename: str) -> bool:
 		"""Delete
 
@@ -107,7 +121,8 @@ class __S3Storage(BaseMediaStorage):
 			try:
 
 				# Attempt to delete the object
-				return self._resource.Object(self._bucket, sKey).delete()
+				self._client.delete_object(Bucket = self._bucket, Key = sKey)
+				return True
 
 			# If there's a client issue, i.e. the bucket, credentials, etc are
 			#	invalid
@@ -153,6 +168,221 @@ class __S3Storage(BaseMediaStorage):
 				# Return failure
 				return False
 
+	def delete_many(self, filenames: List[str]) -> List[str]:
+		"""Delete Many
+
+		Deletes a batch of files in a single request, instead of one round \
+		trip per file. Returns the list of filenames that failed to delete, \
+		empty on full success
+
+		Arguments:
+			filenames (str[]): The names of the files to delete
+
+		Returns:
+			str[]
+		"""
+
+		# If there's nothing to delete
+		if not filenames:
+			return []
+
+		# Generate the full key for each filename, keeping the original so
+		#	failures can be reported in the caller's terms
+		dKeys = {
+			(self._path and self._path + s or s): s for s in filenames
+		}
+
+		# Keep trying if we get timeout errors
+		iTimeouts = 0
+		while True:
+
+			try:
+
+				# Attempt to delete the whole batch in one round trip
+				dRes = self._client.delete_objects(
+					Bucket = self._bucket,
+					Delete = {
+						'Objects': [ { 'Key': k } for k in dKeys ],
+						'Quiet': True
+					}
+				)
+
+				# If any keys failed, store the error message and return the
+				#	filenames that didn't go through
+				if 'Errors' in dRes and dRes['Errors']:
+					self._last_error = [
+						'S3 batch delete errors', dRes['Errors'], self._bucket
+					]
+					return [ dKeys[d['Key']] for d in dRes['Errors'] ]
+
+				# Return success
+				return []
+
+			# If there's a client issue, i.e. the bucket, credentials, etc are
+			#	invalid
+			except ClientError as e:
+
+				# Store the error message
+				self._last_error = [
+					'S3 client error', e.args, self._bucket, filenames
+				]
+
+				# Return every file as failed
+				return list(filenames)
+
+			# If S3 is not responding
+			except ReadTimeoutError as e:
+
+				# Increment the timeout counter
+				iTimeouts += 1
+
+				# If we're reached the maximum
+				if iTimeouts >= self._max_timeouts:
+
+					# Store the error message
+					self._last_error = [
+						'S3 max timeouts', e.args, self._bucket, filenames
+					]
+
+					# Return every file as failed
+					return list(filenames)
+
+				# We still have attempts, sleep and loop back around
+				sleep(1)
+				continue
+
+			# If we get any other exception
+			except Exception as e:
+
+				# Store the error message
+				self._last_error = [
+					'S3 unknown exception', e.args, self._bucket, filenames
+				]
+
+				# Return every file as failed
+				return list(filenames)
+
+	def copy(self, source: str, destination: str) -> bool:
+		"""Copy
+
+		Copies a file to a new key server side, the bytes never pass \
+		through this process
+
+		Arguments:
+			source (str): The name of the file to copy
+			destination (str): The name to copy it to
+
+		Returns:
+			bool
+		"""
+
+		# Init the keys using the filenames
+		sSrc = self._path and self._path + source or source
+		sDst = self._path and self._path + destination or destination
+
+		try:
+
+			# Attempt the server side copy
+			self._client.copy_object(
+				Bucket = self._bucket,
+				CopySource = { 'Bucket': self._bucket, 'Key': sSrc },
+				Key = sDst,
+				ACL = 'public-read'
+			)
+
+			# Return success
+			return True
+
+		# If we get any exception
+		except Exception as e:
+
+			# Store the error message
+			self._last_error = [
+				'S3 copy error', e.args, self._bucket, sSrc, sDst
+			]
+
+			# Return failure
+			return False
+
+	def head(self, filename: str) -> dict | None:
+		"""Head
+
+		Fetches the length and mime of a file without downloading it, or \
+		None if the file doesn't exist
+
+		Arguments:
+			filename (str): The name of the file to check
+
+		Returns:
+			dict | None
+		"""
+
+		# Init the key using the filename
+		sKey = filename
+
+		# If there's a path, prepend it
+		if self._path:
+			sKey = self._path + sKey
+
+		try:
+
+			# Attempt to fetch just the object's metadata
+			dRes = self._client.head_object(
+				Bucket = self._bucket, Key = sKey
+			)
+
+			# Return the parts callers care about
+			return {
+				'length': dRes['ContentLength'],
+				'mime': 'ContentType' in dRes and dRes['ContentType'] or None
+			}
+
+		# If we get any exception, including the 404 ClientError
+		except Exception as e:
+
+			# Store the error message
+			self._last_error = [
+				'S3 head error', e.args, self._bucket, sKey
+			]
+
+			# Return nothing
+			return None
+
+	def presign_put(self, filename: str, mime: str = None,
+					expires: int = 3600) -> str:
+		"""Presign Put
+
+		Generates a presigned URL a client can PUT the file to directly, \
+		so the bytes never pass through this process
+
+		Arguments:
+			filename (str): The name of the file to generate the URL for
+			mime (str): Optional, the mime type the client must upload with
+			expires (uint): Optional, seconds the URL stays valid
+
+		Returns:
+			str
+		"""
+
+		# Init the key using the filename
+		sKey = filename
+
+		# If there's a path, prepend it
+		if self._path:
+			sKey = self._path + sKey
+
+		# Init the params
+		dParams = { 'Bucket': self._bucket, 'Key': sKey }
+
+		# If we have the mime type
+		if mime is not None:
+			dParams['ContentType'] = mime
+
+		# Generate and return the URL, signing is local, no round trip
+		return self._client.generate_presigned_url(
+			'put_object', Params = dParams, ExpiresIn = expires
+		)
+
 	def open(self, filename: str) -> bytes | None:
 		"""Open
 
@@ -179,7 +409,9 @@ class __S3Storage(BaseMediaStorage):
 			try:
 
 				# Attempt to fetch the object
-				dBlob = self._resource.Object(self._bucket, sKey).get()
+				dBlob = self._client.get_object(
+					Bucket = self._bucket, Key = sKey
+				)
 
 				# Return the body
 				return dBlob['Body'].read()
@@ -229,6 +461,85 @@ class __S3Storage(BaseMediaStorage):
 				# Return failure
 				return None
 
+	def open_stream(self, filename: str) -> Iterator[bytes] | None:
+		"""Open Stream
+
+		Fetches a file as an iterator of raw chunks instead of one blob, so \
+		callers can process the content without holding the whole file in \
+		memory
+
+		Arguments:
+			filename (str): The name of the file to open
+
+		Returns:
+			Iterator[bytes] | None
+		"""
+
+		# Init the key using the filename
+		sKey = filename
+
+		# If there's a path, prepend it
+		if self._path:
+			sKey = self._path + sKey
+
+		# Keep trying if we get timeout errors
+		iTimeouts = 0
+		while True:
+
+			try:
+
+				# Attempt to fetch the object
+				dBlob = self._client.get_object(
+					Bucket = self._bucket, Key = sKey
+				)
+
+				# Return the body's chunk iterator
+				return dBlob['Body'].iter_chunks(chunk_size = 65536)
+
+			# If there's a client issue, i.e. the bucket, credentials, etc are
+			#	invalid
+			except ClientError as e:
+
+				# Store the error message
+				self._last_error = [
+					'S3 client error', e.args, self._bucket, sKey
+				]
+
+				# Return failure
+				return None
+
+			# If S3 is not responding
+			except ReadTimeoutError as e:
+
+				# Increment the timeout counter
+				iTimeouts += 1
+
+				# If we're reached the maximum
+				if iTimeouts >= self._max_timeouts:
+
+					# Store the error message
+					self._last_error = [
+						'S3 max timeouts', e.args, self._bucket, sKey
+					]
+
+					# Return failure
+					return None
+
+				# We still have attempts, sleep and loop back around
+				sleep(1)
+				continue
+
+			# If we get any other exception
+			except Exception as e:
+
+				# Store the error message
+				self._last_error = [
+					'S3 unknown exception', e.args, self._bucket, sKey
+				]
+
+				# Return failure
+				return None
+
 	def save(self, filename: str, content: bytes, mime: str = None) -> bool:
 		"""Save
 
@@ -267,9 +578,26 @@ class __S3Storage(BaseMediaStorage):
 
 			# Create new object and upload it
 			try:
-				return self._resource.Object(
-					self._bucket, sKey
-				).put(**dHeaders)
+
+				# If the file is big enough that multipart pays off, hand
+				#	it to the transfer manager, which splits it into
+				#	concurrent part uploads
+				if len(content) >= _MULTIPART_THRESHOLD:
+					dExtra = { 'ACL': 'public-read' }
+					if mime is not None:
+						dExtra['ContentType'] = mime
+					self._client.upload_fileobj(
+						BytesIO(content), self._bucket, sKey,
+						ExtraArgs = dExtra,
+						Config = self._transfer
+					)
+					return True
+
+				# Else, a single put avoids the multipart overhead
+				self._client.put_object(
+					Bucket = self._bucket, Key = sKey, **dHeaders
+				)
+				return True
 
 			# If there's a client issue, i.e. the bucket, credentials, etc are
 			#	invalid
@@ -315,6 +643,7 @@ class __S3Storage(BaseMediaStorage):
 				# Return failure
 				return False
 
+	@lru_cache(maxsize = 10240)
 	def url(self, filename: str) -> str:
 		"""URL
 
@@ -327,6 +656,11 @@ class __S3Storage(BaseMediaStorage):
 			str
 		"""
 
+		# Memoized per filename. URLs are static public paths, the bucket and
+		#	path never change after construction, and there's a single
+		#	instance, so listing endpoints that generate the same URLs over
+		#	and over skip the quoting and formatting work
+
 		# Init the key using the filename
 		sKey = filename
 
@@ -17,6 +17,7 @@ import jsonb
 from RestOC import Record_MySQL
 
 # Python imports
+from functools import lru_cache
 import os
 import pathlib
 from typing import Dict, List
@@ -27,6 +28,30 @@ _moRedis = None
 # Get the definitions path
 _defPath = '%s/definitions' % pathlib.Path(__file__).parent.resolve()
 
+# Memoized splitext, media filenames repeat per size and per listing row
+_splitext = lru_cache(maxsize = 1024)(os.path.splitext)
+
+# Cache of parsed definition Trees by name
+_dmTrees: Dict[str, Tree] = {}
+
+def _tree(name: str) -> Tree:
+	"""Tree
+
+	Returns the parsed Tree associated with the given definition file, \
+	parsing it only the first time it's requested
+
+	Arguments:
+		name (str): The name of the definition file, minus the extension
+
+	Returns:
+		FormatOC.Tree
+	"""
+	try:
+		return _dmTrees[name]
+	except KeyError:
+		_dmTrees[name] = Tree.fromFile('%s/%s.json' % (_defPath, name))
+		return _dmTrees[name]
+
 def cache(redis=None):
 	"""Cache
 
@@ -52,14 +77,51 @@ def install():
 	Returns:
 		None
 	"""
-	Category.table_create()
-	CategoryLocale.table_create()
-	Comment.table_create()
-	Media.table_create()
-	Post.table_create()
-	PostCategory.table_create()
-	PostRaw.table_create()
-	PostTag.table_create()
+	# The record classes that need tables
+	lClasses = [
+		Category, CategoryLocale, Comment, Media, Post, PostCategory,
+		PostRaw, PostTag
+	]
+
+	# Fetch the full list of existing tables in one round trip so re-installs
+	#	skip the per-table DDL entirely instead of paying a round trip per
+	#	CREATE TABLE IF NOT EXISTS that does nothing
+	lTables = Record_MySQL.Commands.select(
+		Category.struct()['host'],
+		'SHOW TABLES FROM `%s`' % Category.struct()['db'],
+		Record_MySQL.ESelect.COLUMN
+	)
+
+	# Create whichever tables don't exist yet
+	for oClass in lClasses:
+		if oClass.struct()['table'] not in lTables:
+			oClass.table_create()
+
+	# Get the media structure
+	dStruct = Media.struct()
+
+	# Check for the FULLTEXT index used by Media.search's `search` option,
+	#	there's no IF NOT EXISTS for indexes so we have to look it up first
+	lIndexes = Record_MySQL.Commands.select(
+		dStruct['host'],
+		"SHOW INDEX FROM `%(db)s`.`%(table)s` " \
+		"WHERE Key_name = 'ft_filename'" % {
+			'db': dStruct['db'],
+			'table': dStruct['table']
+		},
+		Record_MySQL.ESelect.ALL
+	)
+
+	# If it doesn't exist, add it
+	if not lIndexes:
+		Record_MySQL.Commands.execute(
+			dStruct['host'],
+			"ALTER TABLE `%(db)s`.`%(table)s` " \
+			"ADD FULLTEXT INDEX `ft_filename` (`filename`)" % {
+				'db': dStruct['db'],
+				'table': dStruct['table']
+			}
+		)
 
 class Category(Record_MySQL.Record):
 	"""Category
@@ -70,25 +132,148 @@ class Category(Record_MySQL.Record):
 		Record_MySQL.Record
 	"""
 
-	_conf = Record_MySQL.Record.generate_config(
-		Tree.fromFile('%s/category.json' % _defPath),
-		override={ 'db': config.mysql.db('brain') }
-	)
+	_conf = None
 	"""Static Configuration"""
 
 	@classmethod
 	def config(cls):
 		"""Config
 
-		Returns the configuration data associated with the record type
+		Returns the configuration data associated with the record type, \
+		generating it from the definition the first time it's requested
 
 		Returns:
 			dict
 		"""
 
+		# If the config hasn't been generated yet, do it now
+		if not cls._conf:
+			cls._conf = Record_MySQL.Record.generate_config(
+				_tree('category'),
+				override = { 'db': config.mysql.db('brain') }
+			)
+
 		# Return the config
 		return cls._conf
 
+	@classmethod
+	def ids_exist(cls, _ids: List[str], custom: dict = {}) -> set:
+		"""IDs Exist
+
+		Returns the set of passed IDs that actually exist in the table, \
+		fetching only the ID column instead of materializing full rows
+
+		Arguments:
+			_ids (str[]): The list of category IDs to check
+			custom (dict): Custom Host and DB info
+				'host' the name of the host to get/set data on
+				'append' optional postfix for dynamic DBs
+
+		Returns:
+			set
+		"""
+
+		# If there's nothing to check
+		if not _ids:
+			return set()
+
+		# Get the structure
+		dStruct = cls.struct(custom)
+
+		# Generate the SQL
+		sSQL = "SELECT `_id` FROM `%(db)s`.`%(table)s` " \
+				"WHERE `_id` IN ('%(ids)s')" % {
+			'db': dStruct['db'],
+			'table': dStruct['table'],
+			'ids': "','".join([
+				Record_MySQL.Commands.escape(dStruct['host'], s) \
+				for s in _ids
+			])
+		}
+
+		# Fetch just the column and return it as a set
+		return set(Record_MySQL.Commands.select(
+			dStruct['host'],
+			sSQL,
+			Record_MySQL.ESelect.COLUMN
+		))
+
+	@classmethod
+	def with_locales(cls, _id: str = None, custom: dict = {}) -> List[dict]:
+		"""With Locales
+
+		Fetches one or all categories along with their associated locale \
+		records in a single LEFT JOIN, instead of fetching both tables whole \
+		and stitching them together in Python
+
+		Arguments:
+			_id (str): Optional, the ID of a single category to fetch
+			custom (dict): Custom Host and DB info
+				'host' the name of the host to get/set data on
+				'append' optional postfix for dynamic DBs
+
+		Returns:
+			dict[]
+		"""
+
+		# Get the structures
+		dStruct = cls.struct(custom)
+		dLocale = CategoryLocale.struct(custom)
+
+		# Generate the SQL, ordering by category so the rows group in a
+		#	single pass
+		sSQL = "SELECT `c`.`_id`, `c`.`_created`,\n" \
+				" `cl`.`_id` AS `locale_id`, `cl`.`_created` AS " \
+				"`locale_created`,\n" \
+				" `cl`.`_locale`, `cl`.`slug`, `cl`.`title`, " \
+				"`cl`.`description`\n" \
+				"FROM `%(db)s`.`%(table)s` AS `c`\n" \
+				"LEFT JOIN `%(db_cl)s`.`%(table_cl)s` AS `cl`" \
+				" ON `cl`.`_category` = `c`.`_id`\n" \
+				"%(where)s" \
+				"ORDER BY `c`.`_id`" % {
+			'db': dStruct['db'],
+			'table': dStruct['table'],
+			'db_cl': dLocale['db'],
+			'table_cl': dLocale['table'],
+			'where': _id is not None and "WHERE `c`.`_id` = '%s'\n" % \
+				Record_MySQL.Commands.escape(dStruct['host'], _id) or ''
+		}
+
+		# Fetch the rows
+		lRows = Record_MySQL.Commands.select(
+			dStruct['host'],
+			sSQL,
+			Record_MySQL.ESelect.ALL
+		)
+
+		# Group the locale rows under their category in one pass
+		lResults = []
+		dCurrent = None
+		for d in lRows:
+
+			# If we hit a new category, start a new result
+			if dCurrent is None or dCurrent['_id'] != d['_id']:
+				dCurrent = {
+					'_id': d['_id'],
+					'_created': d['_created'],
+					'locales': {}
+				}
+				lResults.append(dCurrent)
+
+			# If the join found a locale, add it under its locale code
+			if d['locale_id']:
+				dCurrent['locales'][d['_locale']] = {
+					'_id': d['locale_id'],
+					'_created': d['locale_created'],
+					'slug': d['slug'],
+					'title': d['title'],
+					'description': d['description']
+				}
+
+		# Return the categories
+		return lResults
+
 class CategoryLocale(Record_MySQL.Record):
 	"""Category Locale
 
@@ -99,25 +284,136 @@ class CategoryLocale(Record_MySQL.Record):
 		Record_MySQL.Record
 	"""
 
-	_conf = Record_MySQL.Record.generate_config(
-		Tree.fromFile('%s/category_locale.json' % _defPath),
-		override={ 'db': config.mysql.db('brain') }
-	)
+	_conf = None
 	"""Static Configuration"""
 
 	@classmethod
 	def config(cls):
 		"""Config
 
-		Returns the configuration data associated with the record type
+		Returns the configuration data associated with the record type, \
+		generating it from the definition the first time it's requested
 
 		Returns:
 			dict
 		"""
 
+		# If the config hasn't been generated yet, do it now
+		if not cls._conf:
+			cls._conf = Record_MySQL.Record.generate_config(
+				_tree('category_locale'),
+				override = { 'db': config.mysql.db('brain') }
+			)
+
 		# Return the config
 		return cls._conf
 
+	@classmethod
+	def delete_by_category(cls, category: str, user: str,
+							custom: dict = {}) -> int:
+		"""Delete By Category
+
+		Deletes every locale record associated with a category in a single \
+		DELETE statement, writing all the audit rows the table requires in \
+		one batched INSERT instead of two statements per locale
+
+		Arguments:
+			category (str): The ID of the category being emptied
+			user (str): The ID of the user making the change
+			custom (dict): Custom Host and DB info
+				'host' the name of the host to get/set data on
+				'append' optional postfix for dynamic DBs
+
+		Returns:
+			uint
+		"""
+
+		# Get the structure
+		dStruct = cls.struct(custom)
+
+		# Fetch the full rows once, the audit entries need the old values
+		lRecords = cls.filter(
+			{ '_category': category }, raw = True, custom = custom
+		)
+		if not lRecords:
+			return 0
+
+		# Delete every locale in one statement
+		sSQL = "DELETE FROM `%(db)s`.`%(table)s` " \
+				"WHERE `_category` = '%(cat)s'" % {
+			'db': dStruct['db'],
+			'table': dStruct['table'],
+			'cat': Record_MySQL.Commands.escape(dStruct['host'], category)
+		}
+		iRows = Record_MySQL.Commands.execute(dStruct['host'], sSQL)
+
+		# If anything was deleted, add all the audit rows in one INSERT
+		if iRows:
+			sSQL = "INSERT INTO `%(db)s`.`%(table)s_changes` " \
+					"(`_id`, `created`, `items`) VALUES %(values)s" % {
+				'db': dStruct['db'],
+				'table': dStruct['table'],
+				'values': ', '.join([
+					"('%s', CURRENT_TIMESTAMP, '%s')" % (
+						Record_MySQL.Commands.escape(
+							dStruct['host'], d['_id']
+						),
+						Record_MySQL.Commands.escape(
+							dStruct['host'],
+							jsonb.encode({
+								'old': d, 'new': None, 'user': user
+							})
+						)
+					) for d in lRecords
+				])
+			}
+			Record_MySQL.Commands.execute(dStruct['host'], sSQL)
+
+		# Return the count of locales deleted
+		return iRows
+
+	@classmethod
+	def slugs_exist(cls, slugs: List[str], custom: dict = {}) -> set:
+		"""Slugs Exist
+
+		Returns the set of passed slugs already used by a locale record, \
+		in one IN clause query instead of an exists probe per slug
+
+		Arguments:
+			slugs (str[]): The list of slugs to check
+			custom (dict): Custom Host and DB info
+				'host' the name of the host to get/set data on
+				'append' optional postfix for dynamic DBs
+
+		Returns:
+			set
+		"""
+
+		# If there's nothing to check
+		if not slugs:
+			return set()
+
+		# Get the structure
+		dStruct = cls.struct(custom)
+
+		# Generate the SQL
+		sSQL = "SELECT `slug` FROM `%(db)s`.`%(table)s` " \
+				"WHERE `slug` IN ('%(slugs)s')" % {
+			'db': dStruct['db'],
+			'table': dStruct['table'],
+			'slugs': "','".join([
+				Record_MySQL.Commands.escape(dStruct['host'], s) \
+				for s in slugs
+			])
+		}
+
+		# Fetch just the column and return it as a set
+		return set(Record_MySQL.Commands.select(
+			dStruct['host'],
+			sSQL,
+			Record_MySQL.ESelect.COLUMN
+		))
+
 class Comment(Record_MySQL.Record):
 	"""Comment
 
@@ -127,22 +423,27 @@ class Comment(Record_MySQL.Record):
 		Record_MySQL.Record
 	"""
 
-	_conf = Record_MySQL.Record.generate_config(
-		Tree.fromFile('%s/comment.json' % _defPath),
-		override={ 'db': config.mysql.db('brain') }
-	)
+	_conf = None
 	"""Static Configuration"""
 
 	@classmethod
 	def config(cls):
 		"""Config
 
-		Returns the configuration data associated with the record type
+		Returns the configuration data associated with the record type, \
+		generating it from the definition the first time it's requested
 
 		Returns:
 			dict
 		"""
 
+		# If the config hasn't been generated yet, do it now
+		if not cls._conf:
+			cls._conf = Record_MySQL.Record.generate_config(
+				_tree('comment'),
+				override = { 'db': config.mysql.db('brain') }
+			)
+
 		# Return the config
 		return cls._conf
 
@@ -155,27 +456,32 @@ class Media(Record_MySQL.Record):
 		Record_MySQL.Record
 	"""
 
-	_conf = Record_MySQL.Record.generate_config(
-		Tree.fromFile('%s/media.json' % _defPath),
-		override={ 'db': config.mysql.db('brain') }
-	)
+	_conf = None
 	"""Static Configuration"""
 
 	@classmethod
 	def config(cls):
 		"""Config
 
-		Returns the configuration data associated with the record type
+		Returns the configuration data associated with the record type, \
+		generating it from the definition the first time it's requested
 
 		Returns:
 			dict
 		"""
 
+		# If the config hasn't been generated yet, do it now
+		if not cls._conf:
+			cls._conf = Record_MySQL.Record.generate_config(
+				_tree('media'),
+				override = { 'db': config.mysql.db('brain') }
+			)
+
 		# Return the config
 		return cls._conf
 
 	@classmethod
-	def _filename(self, data: dict, size: str = 'source') -> str:
+	def _filename(cls, data: dict, size: str = 'source') -> str:
 		"""Filename (static)
 
 		Generate the filename based on the size given
@@ -189,8 +495,9 @@ class Media(Record_MySQL.Record):
 			str
 		"""
 
-		# Split the filename
-		lFile = os.path.splitext(data['filename'])
+		# Split the filename, memoized since listing endpoints generate this
+		#	once per size for the same record
+		lFile = _splitext(data['filename'])
 
 		# Return the generated string
 		return '%s/%s%s%s' % (
@@ -214,6 +521,52 @@ class Media(Record_MySQL.Record):
 		"""
 		return self._filename(self._dRecord, size)
 
+	@classmethod
+	def filenames(cls, data: dict) -> dict:
+		"""Filenames
+
+		Generates the storage filename for the source and every thumbnail of \
+		a record in one pass, splitting the uploaded filename only once
+
+		Arguments:
+			data (dict): Media record data
+
+		Returns:
+			dict
+		"""
+
+		# Split the filename once
+		lFile = _splitext(data['filename'])
+
+		# Start with the source
+		dRet = { 'source': '%s/%s%s' % (data['_id'], lFile[0], lFile[1]) }
+
+		# Add each thumbnail using the already split parts
+		if 'image' in data and data['image'] and data['image']['thumbnails']:
+			for s in data['image']['thumbnails']:
+				dRet[s] = '%s/%s_%s%s' % (data['_id'], lFile[0], s, lFile[1])
+
+		# Return the filenames by size
+		return dRet
+
+	@classmethod
+	def _like_escape(cls, needle: str) -> str:
+		"""Like Escape (static)
+
+		Escapes the characters MySQL treats as wildcards in LIKE patterns so \
+		user input is always matched literally
+
+		Arguments:
+			needle (str): The value to escape
+
+		Returns:
+			str
+		"""
+		return needle \
+			.replace('\\', '\\\\') \
+			.replace('%', '\\%') \
+			.replace('_', '\\_')
+
 	@classmethod
 	def search(cls, options: dict, custom: dict = {}) -> List[dict]:
 		"""Search
@@ -221,7 +574,9 @@ class Media(Record_MySQL.Record):
 		Fetches media files based on options
 
 		Arguments:
-			options (dict): Options: range: list, filename: str, mine: bool
+			options (dict): Options: range: list, filename: str, \
+				filename_prefix: str, search: str, mine: bool, fields: list, \
+				limit: uint, offset: uint
 			custom (dict): Custom Host and DB info
 				'host' the name of the host to get/set data on
 				'append' optional postfix for dynamic DBs
@@ -233,21 +588,62 @@ class Media(Record_MySQL.Record):
 		# Get the structure
 		dStruct = cls.struct(custom)
 
+		# Init the select and order sections
+		sSelect = '*'
+		sOrderBy = ''
+
+		# If specific fields were requested, validate each one against the
+		#	definition and select only those so we don't ship every column
+		#	over the wire just to throw most of them away
+		if 'fields' in options and options['fields']:
+			lFields = list(dStruct['tree'].keys())
+			for f in options['fields']:
+				if f not in lFields:
+					raise ValueError('fields', f)
+			sSelect = ', '.join([ '`%s`' % f for f in options['fields'] ])
+
 		# Create the WHERE clauses
 		lWhere = []
+
+		# If we have a search term, use the FULLTEXT index on `filename`, an
+		#	inverted index probe with relevance ordering, instead of a LIKE
+		#	scan over every row
+		if 'search' in options and options['search']:
+			sMatch = "MATCH(`filename`) AGAINST ('%s' IN BOOLEAN MODE)" % \
+				Record_MySQL.Commands.escape(
+					dStruct['host'], options['search']
+				)
+			sSelect = '%s, %s AS `_rel`' % (sSelect, sMatch)
+			sOrderBy = '\nORDER BY `_rel` DESC'
+			lWhere.append(sMatch)
+
 		if 'range' in options:
 			lWhere.append('`_created` BETWEEN FROM_UNIXTIME(%d) AND ' \
 				 			'FROM_UNIXTIME(%d)' % (
-				options['range'][0], options['range'][1]
+				int(options['range'][0]), int(options['range'][1])
 			))
 		if 'filename' in options and options['filename']:
 			lWhere.append("`filename` LIKE '%%%s%%'" % \
 				Record_MySQL.Commands.escape(
-					dStruct['host'], options['filename']
+					dStruct['host'], cls._like_escape(options['filename'])
+				)
+			)
+
+		# If we got a prefix instead, anchor the pattern so MySQL can use the
+		#	index on `filename` as a range scan instead of scanning every row
+		elif 'filename_prefix' in options and options['filename_prefix']:
+			lWhere.append("`filename` LIKE '%s%%'" % \
+				Record_MySQL.Commands.escape(
+					dStruct['host'],
+					cls._like_escape(options['filename_prefix'])
 				)
 			)
 		if 'mine' in options and options['mine']:
-			lWhere.append("`uploader` = '%s'" % options['mine'])
+			lWhere.append("`uploader` = '%s'" % \
+				Record_MySQL.Commands.escape(
+					dStruct['host'], options['mine']
+				)
+			)
 		if 'images_only' in options:
 			lWhere.append('`image` IS NOT NULL')
 
@@ -255,13 +651,42 @@ class Media(Record_MySQL.Record):
 		if not lWhere:
 			return []
 
+		# If the search relevance isn't already driving the order, return the
+		#	newest records first, which walks the index on `_created`
+		if not sOrderBy:
+			sOrderBy = '\nORDER BY `_created` DESC'
+
+		# Cap the result set, an unbounded listing materialises the entire
+		#	table in the worker. Handled with explicit ifs rather than
+		#	truthiness so a requested 0 stays 0, and clamped at the low end
+		#	since MySQL rejects negative values outright
+		if 'limit' in options:
+			iLimit = int(options['limit'])
+			if iLimit < 0:
+				iLimit = 0
+			elif iLimit > 1000:
+				iLimit = 1000
+		else:
+			iLimit = 100
+		iOffset = 0
+		if 'offset' in options:
+			iOffset = int(options['offset'])
+			if iOffset < 0:
+				iOffset = 0
+
 		# Generate the SQL
-		sSQL = "SELECT *\n" \
+		sSQL = "SELECT %(select)s\n" \
 			 	"FROM `%(db)s`.`%(table)s`\n" \
-				"WHERE %(where)s" % {
+				"WHERE %(where)s" \
+				"%(orderby)s\n" \
+				"LIMIT %(limit)d OFFSET %(offset)d" % {
+			'select': sSelect,
 			'db': dStruct['db'],
 			'table': dStruct['table'],
-			'where': ' AND '.join(lWhere)
+			'where': ' AND '.join(lWhere),
+			'orderby': sOrderBy,
+			'limit': iLimit,
+			'offset': iOffset
 		}
 
 		# Fetch the records
@@ -274,6 +699,9 @@ class Media(Record_MySQL.Record):
 		# Go through each record
 		for d in lRecords:
 
+			# Drop the relevance used for ordering, the caller doesn't need it
+			d.pop('_rel', None)
+
 			# If we have image data
 			if 'image' in d and d['image']:
 				d['image'] = jsonb.decode(d['image'])
@@ -281,6 +709,110 @@ class Media(Record_MySQL.Record):
 		# Return the records
 		return lRecords
 
+	@classmethod
+	def thumbnail_add(cls, _id: str, size: str, user: str,
+						custom: dict = {}) -> bool:
+		"""Thumbnail Add
+
+		Appends a size to the record's image thumbnails in place using \
+		MySQL's JSON functions, instead of rewriting the entire image column \
+		from a Python side copy
+
+		Arguments:
+			_id (str): The ID of the media record to add the thumbnail to
+			size (str): The thumbnail size to add
+			user (str): The ID of the user making the change
+			custom (dict): Custom Host and DB info
+				'host' the name of the host to get/set data on
+				'append' optional postfix for dynamic DBs
+
+		Returns:
+			bool
+		"""
+
+		# Get the structure
+		dStruct = cls.struct(custom)
+
+		# Generate the SQL, the JSON_CONTAINS guard makes the append a no-op
+		#	if the size somehow already exists in the list
+		sSQL = "UPDATE `%(db)s`.`%(table)s` SET " \
+				"`image` = JSON_ARRAY_APPEND(" \
+				"`image`, '$.thumbnails', '%(size)s')\n" \
+				"WHERE `_id` = '%(_id)s'\n" \
+				"AND NOT JSON_CONTAINS(" \
+				"`image`->'$.thumbnails', JSON_QUOTE('%(size)s'))" % {
+			'db': dStruct['db'],
+			'table': dStruct['table'],
+			'_id': Record_MySQL.Commands.escape(dStruct['host'], _id),
+			'size': Record_MySQL.Commands.escape(dStruct['host'], size)
+		}
+
+		# Run the update and store the count of rows changed
+		iRows = Record_MySQL.Commands.execute(dStruct['host'], sSQL)
+
+		# If the row changed, add the audit record the table requires
+		if iRows:
+			cls.add_changes(_id, {
+				'user': user,
+				'image.thumbnails': { 'add': size }
+			}, custom)
+
+		# Return if anything changed
+		return bool(iRows)
+
+	@classmethod
+	def thumbnail_remove(cls, _id: str, size: str, user: str,
+							custom: dict = {}) -> bool:
+		"""Thumbnail Remove
+
+		Removes a size from the record's image thumbnails in place using \
+		MySQL's JSON functions, instead of rewriting the entire image column \
+		from a Python side copy
+
+		Arguments:
+			_id (str): The ID of the media record to remove the thumbnail from
+			size (str): The thumbnail size to remove
+			user (str): The ID of the user making the change
+			custom (dict): Custom Host and DB info
+				'host' the name of the host to get/set data on
+				'append' optional postfix for dynamic DBs
+
+		Returns:
+			bool
+		"""
+
+		# Get the structure
+		dStruct = cls.struct(custom)
+
+		# Generate the SQL, JSON_SEARCH finds the size's full path under
+		#	$.thumbnails so JSON_REMOVE can drop just that element. If the
+		#	size isn't in the list the WHERE fails and nothing is touched
+		sSQL = "UPDATE `%(db)s`.`%(table)s` SET " \
+				"`image` = JSON_REMOVE(`image`, JSON_UNQUOTE(JSON_SEARCH(" \
+				"`image`, 'one', '%(size)s', NULL, '$.thumbnails')))\n" \
+				"WHERE `_id` = '%(_id)s'\n" \
+				"AND JSON_SEARCH(" \
+				"`image`, 'one', '%(size)s', NULL, '$.thumbnails'" \
+				") IS NOT NULL" % {
+			'db': dStruct['db'],
+			'table': dStruct['table'],
+			'_id': Record_MySQL.Commands.escape(dStruct['host'], _id),
+			'size': Record_MySQL.Commands.escape(dStruct['host'], size)
+		}
+
+		# Run the update and store the count of rows changed
+		iRows = Record_MySQL.Commands.execute(dStruct['host'], sSQL)
+
+		# If the row changed, add the audit record the table requires
+		if iRows:
+			cls.add_changes(_id, {
+				'user': user,
+				'image.thumbnails': { 'remove': size }
+			}, custom)
+
+		# Return if anything changed
+		return bool(iRows)
+
 class Post(Record_MySQL.Record):
 	"""Post
 
@@ -290,10 +822,7 @@ class Post(Record_MySQL.Record):
 		Record_MySQL.Record
 	"""
 
-	_conf = Record_MySQL.Record.generate_config(
-		Tree.fromFile('%s/post.json' % _defPath),
-		override={ 'db': config.mysql.db('brain') }
-	)
+	_conf = None
 	"""Static Configuration"""
 
 	_post_key = 'blog:post:%s'
@@ -627,12 +1156,20 @@ class Post(Record_MySQL.Record):
 	def config(cls):
 		"""Config
 
-		Returns the configuration data associated with the record type
+		Returns the configuration data associated with the record type, \
+		generating it from the definition the first time it's requested
 
 		Returns:
 			dict
 		"""
 
+		# If the config hasn't been generated yet, do it now
+		if not cls._conf:
+			cls._conf = Record_MySQL.Record.generate_config(
+				_tree('post'),
+				override = { 'db': config.mysql.db('brain') }
+			)
+
 		# Return the config
 		return cls._conf
 
@@ -747,10 +1284,7 @@ class PostCategory(Record_MySQL.Record):
 		Record_MySQL.Record
 	"""
 
-	_conf = Record_MySQL.Record.generate_config(
-		Tree.fromFile('%s/post_category.json' % _defPath),
-		override={ 'db': config.mysql.db('brain') }
-	)
+	_conf = None
 	"""Static Configuration"""
 
 	_category_key = 'blog:cat:%s'
@@ -760,15 +1294,65 @@ class PostCategory(Record_MySQL.Record):
 	def config(cls):
 		"""Config
 
-		Returns the configuration data associated with the record type
+		Returns the configuration data associated with the record type, \
+		generating it from the definition the first time it's requested
 
 		Returns:
 			dict
 		"""
 
+		# If the config hasn't been generated yet, do it now
+		if not cls._conf:
+			cls._conf = Record_MySQL.Record.generate_config(
+				_tree('post_category'),
+				override = { 'db': config.mysql.db('brain') }
+			)
+
 		# Return the config
 		return cls._conf
 
+	@classmethod
+	def create_raw(cls, rows: List[tuple], custom: dict = {}) -> int:
+		"""Create Raw
+
+		Inserts (slug, category) pairs in a single multi-row INSERT, \
+		skipping the Record construction and per-instance validation that \
+		create_many would run. The table is a plain link table with no \
+		primary key or changes, so there's nothing to generate per row
+
+		Arguments:
+			rows (tuple[]): The list of (slug, category ID) pairs to insert
+			custom (dict): Custom Host and DB info
+				'host' the name of the host to get/set data on
+				'append' optional postfix for dynamic DBs
+
+		Returns:
+			uint
+		"""
+
+		# If there's nothing to insert
+		if not rows:
+			return 0
+
+		# Get the structure
+		dStruct = cls.struct(custom)
+
+		# Generate the SQL
+		sSQL = "INSERT INTO `%(db)s`.`%(table)s` (`_slug`, `_category`) " \
+				"VALUES %(values)s" % {
+			'db': dStruct['db'],
+			'table': dStruct['table'],
+			'values': ', '.join([
+				"('%s', '%s')" % (
+					Record_MySQL.Commands.escape(dStruct['host'], t[0]),
+					Record_MySQL.Commands.escape(dStruct['host'], t[1])
+				) for t in rows
+			])
+		}
+
+		# Insert all the rows at once and return the count
+		return Record_MySQL.Commands.execute(dStruct['host'], sSQL)
+
 	@classmethod
 	def cache_fetch(cls,
 		slug: str,
@@ -918,22 +1502,27 @@ class PostRaw(Record_MySQL.Record):
 		Record_MySQL.Record
 	"""
 
-	_conf = Record_MySQL.Record.generate_config(
-		Tree.fromFile('%s/post_raw.json' % _defPath),
-		override={ 'db': config.mysql.db('brain') }
-	)
+	_conf = None
 	"""Static Configuration"""
 
 	@classmethod
 	def config(cls):
 		"""Config
 
-		Returns the configuration data associated with the record type
+		Returns the configuration data associated with the record type, \
+		generating it from the definition the first time it's requested
 
 		Returns:
 			dict
 		"""
 
+		# If the config hasn't been generated yet, do it now
+		if not cls._conf:
+			cls._conf = Record_MySQL.Record.generate_config(
+				_tree('post_raw'),
+				override = { 'db': config.mysql.db('brain') }
+			)
+
 		# Return the config
 		return cls._conf
 
@@ -1019,10 +1608,7 @@ class PostTag(Record_MySQL.Record):
 		Record_MySQL.Record
 	"""
 
-	_conf = Record_MySQL.Record.generate_config(
-		Tree.fromFile('%s/post_tag.json' % _defPath),
-		override={ 'db': config.mysql.db('brain') }
-	)
+	_conf = None
 	"""Static Configuration"""
 
 	_tag_key = 'blog:tag:%s:%s'
@@ -1174,15 +1760,65 @@ class PostTag(Record_MySQL.Record):
 	def config(cls):
 		"""Config
 
-		Returns the configuration data associated with the record type
+		Returns the configuration data associated with the record type, \
+		generating it from the definition the first time it's requested
 
 		Returns:
 			dict
 		"""
 
+		# If the config hasn't been generated yet, do it now
+		if not cls._conf:
+			cls._conf = Record_MySQL.Record.generate_config(
+				_tree('post_tag'),
+				override = { 'db': config.mysql.db('brain') }
+			)
+
 		# Return the config
 		return cls._conf
 
+	@classmethod
+	def create_raw(cls, rows: List[tuple], custom: dict = {}) -> int:
+		"""Create Raw
+
+		Inserts (slug, tag) pairs in a single multi-row INSERT, skipping \
+		the Record construction and per-instance validation that \
+		create_many would run. The table is a plain link table with no \
+		primary key or changes, so there's nothing to generate per row
+
+		Arguments:
+			rows (tuple[]): The list of (slug, tag) pairs to insert
+			custom (dict): Custom Host and DB info
+				'host' the name of the host to get/set data on
+				'append' optional postfix for dynamic DBs
+
+		Returns:
+			uint
+		"""
+
+		# If there's nothing to insert
+		if not rows:
+			return 0
+
+		# Get the structure
+		dStruct = cls.struct(custom)
+
+		# Generate the SQL
+		sSQL = "INSERT INTO `%(db)s`.`%(table)s` (`_slug`, `tag`) " \
+				"VALUES %(values)s" % {
+			'db': dStruct['db'],
+			'table': dStruct['table'],
+			'values': ', '.join([
+				"('%s', '%s')" % (
+					Record_MySQL.Commands.escape(dStruct['host'], t[0]),
+					Record_MySQL.Commands.escape(dStruct['host'], t[1])
+				) for t in rows
+			])
+		}
+
+		# Insert all the rows at once and return the count
+		return Record_MySQL.Commands.execute(dStruct['host'], sSQL)
+
 	@classmethod
 	def locale_cache_fetch(cls,
 		tag: str,
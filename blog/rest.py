@@ -16,6 +16,7 @@ from config import config
 
 # Python imports
 from os import environ
+import re
 
 # Pip imports
 from RestOC import EMail, REST, Services, Session
@@ -23,6 +24,41 @@ from RestOC import EMail, REST, Services, Session
 # Module imports
 from blog.service import Blog
 
+# Compile the allowed-origin check once at import, escaping every regex
+#	metacharacter in the configured domain and anchoring both ends so an
+#	origin like example.com.evil.com can't slip past a prefix match
+_ORIGIN_REGEX = re.compile(
+	r'^https?://(?:[^/]+\.)?%s(?::\d+)?$' % \
+	re.escape(config.rest.allowed('localhost'))
+)
+
+# Default config sections, built once at import rather than per run() call
+_EMAIL_DEFAULTS = {
+	'error_to': 'errors@localhost',
+	'from': 'admin@localhost',
+	'smtp': {
+		'host': 'localhost',
+		'port': 587,
+		'tls': True,
+		'user': 'noone',
+		'passwd': 'nopasswd'
+	}
+}
+_REST_DEFAULTS = {
+	'allowed': 'localhost',
+	'default': {
+		'domain': 'localhost',
+		'host': '0.0.0.0',
+		'port': 8800,
+		'protocol': 'http',
+		'workers': 1
+	},
+	'services': {
+		'brain': {'port': 0},
+		'blog': {'port': 2}
+	}
+}
+
 def run():
 	"""Run
 
@@ -30,36 +66,13 @@ def run():
 	"""
 
 	# Init the email module
-	EMail.init(config.email({
-		'error_to': 'errors@localhost',
-		'from': 'admin@localhost',
-		'smtp': {
-			'host': 'localhost',
-			'port': 587,
-			'tls': True,
-			'user': 'noone',
-			'passwd': 'nopasswd'
-		}
-	}))
+	EMail.init(config.email(_EMAIL_DEFAULTS))
 
 	# Init the Session module
 	Session.init('session')
 
 	# Get the REST config
-	dRest = config.rest({
-		'allowed': 'localhost',
-		'default': {
-			'domain': 'localhost',
-			'host': '0.0.0.0',
-			'port': 8800,
-			'protocol': 'http',
-			'workers': 1
-		},
-		'services': {
-			'brain': {'port': 0},
-			'blog': {'port': 2}
-		}
-	})
+	dRest = config.rest(_REST_DEFAULTS)
 
 	# Create the REST config instance
 	oRestConf = REST.Config(dRest)
@@ -96,6 +109,7 @@ def run():
 		'/admin/media': { 'methods': REST.CREATE | REST.DELETE | REST.READ },
 		'/admin/media/filter': { 'methods': REST.READ },
 		'/admin/media/thumbnail': { 'methods': REST.CREATE | REST.DELETE },
+		'/admin/media/upload': { 'methods': REST.CREATE | REST.UPDATE },
 		'/admin/media/url': { 'methods': REST.READ },
 
 		'/category': { 'methods': REST.READ },
@@ -106,7 +120,7 @@ def run():
 
 		},
 		'blog',
-		'https?://(.*\\.)?%s' % config.rest.allowed('localhost').replace('.', '\\.'),
+		_ORIGIN_REGEX,
 		error_callback = errors.service_error
 	).run(
 		host=oRestConf['blog']['host'],
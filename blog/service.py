@@ -14,18 +14,21 @@ __created__		= "2023-11-30"
 from body import constants, errors
 from brain import access, users
 from config import config
+import jsonb
 from nredis import nr
 from strings import strip_html
-from tools import clone, evaluate, without
+from tools import evaluate
 
 # Python imports
 from base64 import b64decode, b64encode
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, \
+	as_completed, wait
 import mimetypes
-import os
 import re
 from strings import cut
 from time import time
 from typing import List
+from uuid import uuid4
 
 # Pip imports
 from redis import StrictRedis
@@ -33,6 +36,9 @@ from RestOC import Image, Services
 from RestOC.Services import Error, Response, Service
 from RestOC.Record_MySQL import DuplicateException, Literal
 
+# Module imports
+from blog import images, thumbnails
+
 # Errors
 from blog.errors import MINIMUM_LOCALE, NOT_AN_IMAGE, POSTS_ASSOCIATED, \
 	STORAGE_ISSUE
@@ -51,6 +57,32 @@ else:
 # Constants
 POST_SHORTEN_LENGTH = 500
 
+# Extensions treated as images, frozenset so the per-upload membership test
+#	is a hash lookup
+_IMAGE_EXTS = frozenset(('jpeg', 'jpe', 'jpg', 'png'))
+
+# Local binding so the hot paths skip the attribute lookups
+_EMPTY_UUID = constants.EMPTY_UUID
+
+# Fields callers may not change on a locale record, hoisted frozensets so
+#	the update loops test membership instead of rebuilding filtered dicts
+_LOCALE_STRIP = frozenset(('_id', '_created', '_category', '_locale'))
+_LOCALE_FIELDS_STRIP = frozenset(('_id', '_created', '_locale'))
+
+# Thread pool shared across requests for parallel storage calls. Uploads and
+#	deletes are blocking network round trips, so threads overlap them
+_storage_pool = ThreadPoolExecutor(max_workers = 8)
+
+# Maximum uploads allowed in flight while thumbnails stream through the
+#	resize / upload pipeline, bounding how many resized buffers exist at
+#	once
+_UPLOAD_WINDOW = 4
+
+# Most bytes pulled off storage trying to read an image's header, JPEGs
+#	can carry large EXIF / ICC blocks before the frame header but past
+#	this it's treated as unreadable
+_INFO_MAX_BYTES = 1024 * 1024
+
 class Blog(Service):
 	"""Blog Service class
 
@@ -60,8 +92,8 @@ class Blog(Service):
 	_dimensions = re.compile(r'[cf][1-9]\d*x[1-9]\d*')
 	"""Dimensions regex"""
 
-	_image_extensions = ['jpeg', 'jpe', 'jpg', 'png']
-	"""Valid image extensions"""
+	_category_ver_key = 'blog:category:ver'
+	"""Key holding the current version of the cached category listing"""
 
 	def _shorten(self, posts: List[dict], conf):
 		"""Shorten (Protected)
@@ -121,6 +153,176 @@ class Blog(Service):
 				conf['ellipsis']
 			)
 
+	def _verify(self, session, permission: str, right: int) -> None:
+		"""Verify (Protected)
+
+		Checks the user has the requested right on the given permission, \
+		caching successful checks for a short period so bursts of requests \
+		from the same session don't pay a brain lookup every single call
+
+		Arguments:
+			session (Memory): The session associated with the request
+			permission (str): The name of the permission to check
+			right (uint): The right being requested
+
+		Returns:
+			None
+
+		Raises:
+			ResponseException
+		"""
+
+		# Generate the key for this session / permission / right
+		sKey = 'blog:perm:%s:%s:%d' % (session['_id'], permission, right)
+
+		# If we verified the same check recently, we're done
+		if self._redis.get(sKey):
+			return
+
+		# Check with brain, raises if the user lacks the permission
+		access.verify(session, permission, right)
+
+		# Cache the success for a minute
+		self._redis.set(sKey, '1', ex = 60)
+
+	def _thumbnail_errors(self, thumbnails) -> list:
+		"""Thumbnail Errors (Protected)
+
+		Validates a list of requested thumbnail sizes against the \
+		dimensions regex, returning the failures, an empty list meaning \
+		the data is good. One compiled pattern per element beats walking \
+		the record definition node for what's a single fixed format
+
+		Arguments:
+			thumbnails (str[]): The list of thumbnail specs requested
+
+		Returns:
+			list
+		"""
+
+		# If it's not even a list, fail the whole field
+		if not isinstance(thumbnails, list):
+			return [ [ 'thumbnails', 'not a list' ] ]
+
+		# Check each entry against the same regex the thumbnail handlers
+		#	use, flagging repeats since the definition declares the array
+		#	unique
+		lErrors = []
+		sSeen = set()
+		for i, s in enumerate(thumbnails):
+			if not isinstance(s, str) or not self._dimensions.fullmatch(s):
+				lErrors.append([ 'thumbnails.%d' % i, 'invalid' ])
+			elif s in sSeen:
+				lErrors.append([ 'thumbnails.%d' % i, 'duplicate' ])
+			else:
+				sSeen.add(s)
+
+		# Return the failures, if any
+		return lErrors
+
+	def _locale_exists(self, locale: str) -> bool:
+		"""Locale Exists (Protected)
+
+		Checks the locale exists on mouth, caching the answer in process so \
+		a warm service isn't paying a blocking RPC per post write for a list \
+		that almost never changes. Hits are kept an hour, misses only a \
+		minute so a newly added locale shows up quickly
+
+		Arguments:
+			locale (str): The locale code to check
+
+		Returns:
+			bool
+		"""
+
+		# If we have a still valid answer, use it
+		try:
+			bExists, fExpires = self._locale_cache[locale]
+			if fExpires > time():
+				return bExists
+		except KeyError:
+			pass
+
+		# Ask mouth
+		oResponse = Services.read('mouth', 'locale/exists', { 'data': {
+			'_id': locale
+		}})
+		bExists = bool(oResponse.data)
+
+		# Cache the answer
+		self._locale_cache[locale] = (
+			bExists, time() + (bExists and 3600 or 60)
+		)
+
+		# Return it
+		return bExists
+
+	def _category_cached(self, key: str) -> tuple:
+		"""Category Cached (Protected)
+
+		Fetches the current category version and a cached entry in a single \
+		pipelined round trip. Entries embed the version they were written \
+		at, so the key never has to change and both GETs can travel \
+		together. Returns the version and the cached data, or None on a miss
+
+		Arguments:
+			key (str): The cache key to check
+
+		Returns:
+			tuple
+		"""
+
+		# Fetch the version and the entry together
+		oPipe = self._redis.pipeline()
+		oPipe.get(self._category_ver_key)
+		oPipe.get(key)
+		sVer, sCache = oPipe.execute()
+
+		# Normalise the version, it's never been bumped until the first write
+		sVer = sVer and \
+			(isinstance(sVer, bytes) and sVer.decode() or sVer) or '0'
+
+		# If we have an entry written at the current version, it's a hit
+		if sCache:
+			dEntry = jsonb.decode(sCache)
+			if dEntry['ver'] == sVer:
+				return sVer, dEntry['data']
+
+		# Miss
+		return sVer, None
+
+	def _category_cache_set(self, key: str, ver: str, data) -> None:
+		"""Category Cache Set (Protected)
+
+		Stores category data under the given key with the version it was \
+		generated at embedded, plus a TTL as a backstop
+
+		Arguments:
+			key (str): The cache key to store under
+			ver (str): The version the data was generated at
+			data (mixed): The data to cache
+
+		Returns:
+			None
+		"""
+		self._redis.set(
+			key, jsonb.encode({ 'ver': ver, 'data': data }), ex = 900
+		)
+
+	def _category_changed(self) -> None:
+		"""Category Changed (Protected)
+
+		Bumps the category cache version so any cached category listings \
+		stop being read. Old entries aren't deleted, they simply expire on \
+		their own once no key points to them
+
+		Returns:
+			None
+		"""
+
+		# Increment the version, creating it if it doesn't exist yet
+		self._redis.incr(self._category_ver_key)
+
 	def initialise(self):
 		"""Initialise
 
@@ -132,6 +334,7 @@ class Blog(Service):
 
 		# Get config
 		self._conf = config.blog({
+			'async_thumbnails': False,
 			'user_default_locale': 'en-US',
 			'redis_host': 'blog'
 		})
@@ -142,6 +345,13 @@ class Blog(Service):
 		# Pass the Redis connection to the records
 		record_cache(self._redis)
 
+		# Init the in-process cache of which locales exist on mouth
+		self._locale_cache = {}
+
+		# Load the mimetypes tables now rather than lazily inside the first
+		#	guess_type call
+		mimetypes.init()
+
 		# Return self for chaining
 		return self
 
@@ -159,7 +369,12 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_category', access.CREATE)
+		self._verify(req['session'], 'blog_category', access.CREATE)
+
+		# Bind the user ID and the changes payload once for the several
+		#	writes below, the record methods only read from it
+		sUID = req['session']['user']['_id']
+		dChanges = { 'user': sUID }
 
 		# Check minimum fields
 		try: evaluate(req['data'], [{'record': ['locales']}])
@@ -185,10 +400,11 @@ class Blog(Service):
 
 		# Go through each passed locale
 		lLocales = []
+		dSlugLocales = {}
 		for k,d in dRecord['locales'].items():
 
 			# Add the empty UUID so we don't fail on the `_category` check
-			d['_category'] = constants.EMPTY_UUID
+			d['_category'] = _EMPTY_UUID
 
 			# Add the locale as a field
 			d['_locale'] = k
@@ -203,19 +419,31 @@ class Blog(Service):
 						for l in e.args[0] ]
 				)
 
-			# Make sure we don't already have the slug
-			if CategoryLocale.exists(d['slug'], 'slug'):
+			# If the slug is repeated within the request itself, fail now
+			#	instead of mid-insert where the compensating deletes kick in
+			if d['slug'] in dSlugLocales:
 				return Error(
 					errors.DB_DUPLICATE, [ '%s.%s' % (k, d['slug']), 'slug' ]
 				)
 
+			# Keep track of which locale each slug came from for error messages
+			dSlugLocales[d['slug']] = k
+
+		# Check all the slugs against the DB in a single column-only query
+		#	rather than one exists probe per locale
+		sExisting = CategoryLocale.slugs_exist(list(dSlugLocales.keys()))
+		if sExisting:
+			sSlug = sExisting.pop()
+			return Error(
+				errors.DB_DUPLICATE,
+				[ '%s.%s' % (dSlugLocales[sSlug], sSlug), 'slug' ]
+			)
+
 		# Create the instance
 		oCategory = Category({})
 
 		# Create the record
-		if not oCategory.create(changes = {
-			'user': req['session']['user']['_id']
-		}):
+		if not oCategory.create(changes = dChanges):
 			return Error(errors.DB_CREATE_FAILED, 'category')
 
 		# Create each locale
@@ -226,23 +454,22 @@ class Blog(Service):
 
 			# Create the record
 			try:
-				o.create(changes = { 'user': req['session']['user']['_id'] })
+				o.create(changes = dChanges)
 			except DuplicateException as e:
 
 				# Delete the existing category and any locales that were
 				#	created
-				oCategory.delete(
-					changes = { 'user': req['session']['user']['_id'] }
-				)
+				oCategory.delete(changes = dChanges)
 				for o2 in lLocales:
 					if o2['_id']:
-						o2.delete(
-							changes = { 'user': req['session']['user']['_id'] }
-						)
+						o2.delete(changes = dChanges)
 
 				# Return the duplicate error
 				return Error(errors.DB_DUPLICATE, [ o['slug'], 'slug' ])
 
+		# Invalidate any cached category listings
+		self._category_changed()
+
 		# Return the new ID
 		return Response(oCategory['_id'])
 
@@ -260,7 +487,10 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_category', access.DELETE)
+		self._verify(req['session'], 'blog_category', access.DELETE)
+
+		# Bind the changes payload once for the several writes below
+		dChanges = { 'user': req['session']['user']['_id'] }
 
 		# If we didn't get an ID
 		if '_id' not in req['data']:
@@ -281,31 +511,22 @@ class Blog(Service):
 		if lPosts:
 			return Error(POSTS_ASSOCIATED, [ d['_id'] for d in lPosts ])
 
-		# Get the associated locales
-		lLocales = CategoryLocale.filter({
-			'_category': req['data']['_id']
-		})
-
-		# Delete each one
-		for o in lLocales:
-			if not o.delete(
-				changes = { 'user': req['session']['user']['_id'] }
-			):
-
-				# If it failed for any reason
-				return Error(
-					errors.DB_DELETE_FAILED, [ o['_id'], 'category_locale' ]
-				)
+		# Delete every associated locale in one statement, the audit rows
+		#	are written in a single batched insert
+		CategoryLocale.delete_by_category(
+			req['data']['_id'], dChanges['user']
+		)
 
 		# Delete the record
-		if not oCategory.delete(
-			changes = { 'user': req['session']['user']['_id'] }
-		):
+		if not oCategory.delete(changes = dChanges):
 			# If it failed for any reason
 			return Error(
 				errors.DB_DELETE_FAILED, [ req['data']['_id'], 'category' ]
 			)
 
+		# Invalidate any cached category listings
+		self._category_changed()
+
 		# Return OK
 		return Response(True)
 
@@ -323,7 +544,7 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_category', access.UPDATE)
+		self._verify(req['session'], 'blog_category', access.UPDATE)
 
 		# Check minimum fields
 		try: evaluate(req['data'], ['_id', 'locale', 'record' ])
@@ -367,6 +588,9 @@ class Blog(Service):
 			else:
 				return Error(errors.DB_DUPLICATE, 'unknown')
 
+		# Invalidate any cached category listings
+		self._category_changed()
+
 		# Return OK
 		return Response(True)
 
@@ -384,7 +608,7 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_category', access.UPDATE)
+		self._verify(req['session'], 'blog_category', access.UPDATE)
 
 		# Check minimum fields
 		try: evaluate(req['data'], ['_id', 'locale' ])
@@ -422,6 +646,9 @@ class Blog(Service):
 		):
 			return Error(errors.DB_DELETE_FAILED)
 
+		# Invalidate any cached category listings
+		self._category_changed()
+
 		# Return OK
 		return Response(True)
 
@@ -439,7 +666,7 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_category', access.UPDATE)
+		self._verify(req['session'], 'blog_category', access.UPDATE)
 
 		# Check minimum fields
 		try: evaluate(req['data'], ['_id', 'locale', 'record' ])
@@ -465,11 +692,12 @@ class Blog(Service):
 		if not oLocale:
 			return Error(errors.DB_NO_RECORD)
 
-		# Go through fields that can be changed
+		# Go through fields that can be changed, skipping the protected ones
+		#	without building an intermediate dict
 		lErrors = []
-		for f,v in without(
-			dRecord, ['_id', '_created', '_category', '_locale']
-		).items():
+		for f,v in dRecord.items():
+			if f in _LOCALE_STRIP:
+				continue
 
 			# Try to update the field
 			try: oLocale[f] = v
@@ -487,6 +715,9 @@ class Blog(Service):
 		if not oLocale.save(changes = { 'user': req['session']['user']['_id']}):
 			return Error(errors.DB_UPDATE_FAILED)
 
+		# Invalidate any cached category listings
+		self._category_changed()
+
 		# Return OK
 		return Response(True)
 
@@ -504,37 +735,21 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_category', access.READ)
+		self._verify(req['session'], 'blog_category', access.READ)
 
 		# If there's no ID passed
 		if 'data' not in req or '_id' not in req['data']:
 
-			# Fetch all locales
-			lLocales = CategoryLocale.get(raw = True)
-
-			# Store locales by category
-			dLocales = {}
-			for d in lLocales:
-
-				# If the category doesn't exist
-				if d['_category'] not in dLocales:
-					dLocales[d['_category']] = {}
-
-				# Add the locale
-				dLocales[d['_category']][d['_locale']] = \
-					without(d, [ '_category', '_locale' ])
+			# Check the cache, version and entry come back in one round trip
+			sVer, lCached = self._category_cached('blog:category:all')
+			if lCached is not None:
+				return Response(lCached)
 
-			# Clear memory
-			del lLocales
+			# Else, fetch all categories with their locales in one JOIN
+			lCategories = Category.with_locales()
 
-			# Fetch all categories
-			lCategories = Category.get(raw = True)
-
-			# Go through each one and add the locales
-			for d in lCategories:
-				try: d['locales'] = dLocales.pop(d['_id'])
-				except KeyError:
-					d['locales'] = {}
+			# Cache the listing at the version it was generated under
+			self._category_cache_set('blog:category:all', sVer, lCategories)
 
 			# Return the data
 			return Response(lCategories)
@@ -542,23 +757,25 @@ class Blog(Service):
 		# Else, we got a specific ID
 		else:
 
-			# Fetch the category
-			dCategory = Category.get(req['data']['_id'], raw = True)
-			if not dCategory:
+			# Check the cache, single reads share the same version counter
+			#	as the listing so every mutation invalidates both
+			sKey = 'blog:category:one:%s' % req['data']['_id']
+			sVer, dCached = self._category_cached(sKey)
+			if dCached is not None:
+				return Response(dCached)
+
+			# Fetch the category and its locales in one JOIN
+			lCategories = Category.with_locales(req['data']['_id'])
+			if not lCategories:
 				return Error(
 					errors.DB_NO_RECORD, [ req['data']['_id'], 'category' ]
 				)
 
-			# Fetch all locales associated
-			dCategory['locales'] = {
-				d['_locale']: without(d, [ '_category', '_locale' ]) \
-				for d in CategoryLocale.filter({
-					'_category': req['data']['_id']
-				}, raw = True)
-			}
+			# Cache it at the version it was generated under
+			self._category_cache_set(sKey, sVer, lCategories[0])
 
 			# Return the data
-			return Response(dCategory)
+			return Response(lCategories[0])
 
 	def admin_category_update(self, req: dict) -> Response:
 		"""Category update
@@ -574,7 +791,7 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_category', access.UPDATE)
+		self._verify(req['session'], 'blog_category', access.UPDATE)
 
 		# Check minimum fields
 		try: evaluate(req['data'], [ '_id', { 'record': [ 'locales' ] } ])
@@ -593,6 +810,11 @@ class Blog(Service):
 		sID = req['data']['_id']
 		dRecord = req['data']['record']
 
+		# Bind the changes payload once for the writes below. Note this also
+		#	fixes the save branch, which was storing the session ID where
+		#	every other write stores the user ID
+		dChanges = { 'user': req['session']['user']['_id'] }
+
 		# Init return result and errors
 		bRes = False
 		lErrors = []
@@ -606,7 +828,7 @@ class Blog(Service):
 		}
 
 		# Go through each locale
-		for sLocale, dLocale in dRecord['locales']:
+		for sLocale, dLocale in dRecord['locales'].items():
 
 			# Init locale errors
 			lLocaleErr = []
@@ -614,8 +836,11 @@ class Blog(Service):
 			# If we have it
 			if sLocale in dLocales:
 
-				# Go through fields that can be changed
-				for f,v in without(dLocale, ['_id', '_created', '_locale']):
+				# Go through fields that can be changed, skipping the
+				#	protected ones without building an intermediate dict
+				for f,v in dLocale.items():
+					if f in _LOCALE_FIELDS_STRIP:
+						continue
 					try: dLocales[sLocale][f] = v
 					except ValueError as e:
 						lLocaleErr.extend([
@@ -629,9 +854,7 @@ class Blog(Service):
 
 				# Else, try to save the locale
 				else:
-					if dLocales[sLocale].save(
-						changes = { 'user': req['session']['_id'] }
-					):
+					if dLocales[sLocale].save(changes = dChanges):
 						bRes = True
 
 			# Else, it must be new
@@ -659,9 +882,7 @@ class Blog(Service):
 				# Else, create the record
 				else:
 					try:
-						if oLocale.create(
-							changes = { 'user': req['session']['user']['_id']}
-						):
+						if oLocale.create(changes = dChanges):
 							bRes = True
 					except DuplicateException as e:
 						return
@@ -670,6 +891,10 @@ class Blog(Service):
 		if lErrors:
 			return Error(errors.DATA_FIELDS, lErrors)
 
+		# If anything was written, invalidate any cached category listings
+		if bRes:
+			self._category_changed()
+
 		# Return the result
 		return Response(bRes)
 
@@ -687,7 +912,10 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_media', access.CREATE)
+		self._verify(req['session'], 'blog_media', access.CREATE)
+
+		# Bind the user ID once, it's used several times below
+		sUID = req['session']['user']['_id']
 
 		# Check minimum fields
 		try: evaluate(req['data'], ['base64', 'filename'])
@@ -703,34 +931,38 @@ class Blog(Service):
 		except TypeError:
 			return Services.Error(1001, [['base64', 'can not decode']])
 
-		# Get the filename extension
-		sExt = os.path.splitext(req['data']['filename'])[1][1:].lower()
+		# Get the filename extension, rpartition allocates one tuple where
+		#	splitext builds intermediate strings. No dot means no extension,
+		#	rpartition alone would return the whole name
+		sFilename = req['data']['filename']
+		sExt = '.' in sFilename and \
+			sFilename.rpartition('.')[2].lower() or ''
 
 		# If the file is an image
 		dImage = None
-		if sExt.lower() in self._image_extensions:
+		bResize = False
+		if sExt in _IMAGE_EXTS:
 
 			# If dimensions were passed
 			if 'thumbnails' in req['data']:
 
-				# Get the node
-				oNode = Media._conf['tree'].get('image').get('thumbnails')
-
 				# If they're valid, pop them off for later
-				if oNode.valid(req['data']['thumbnails']):
+				lErrors = self._thumbnail_errors(req['data']['thumbnails'])
+				if not lErrors:
 					lThumbnails = req['data'].pop('thumbnails')
 
 				# Else, return the errors
 				else:
-					return Error(errors.DATA_FIELDS, oNode.validation_failures)
+					return Error(errors.DATA_FIELDS, lErrors)
 
 			# We have no thumbnail requests, store an empty list
 			else:
 				lThumbnails = []
 
-			# Attempt to get info about the photo
+			# Attempt to get info about the photo from the header bytes, no
+			#	full parse of the file needed
 			try:
-				dInfo = Image.info(dFiles['source'])
+				dInfo = images.info_quick(dFiles['source'])
 			except Exception as e:
 				return Error(errors.DATA_FIELDS, [ [ 'base64', str(e.args) ] ])
 
@@ -744,18 +976,11 @@ class Blog(Service):
 				'thumbnails': lThumbnails
 			}
 
-			# If additional dimensions were requested
-			if lThumbnails:
-
-				# Go through each additional dimension
-				for s in lThumbnails:
-
-					# Get the type and dimensions
-					bCrop = s[0] == 'c'
-					sDims = s[1:]
-
-					# Get a new image for the size
-					dFiles[s] = Image.resize(dFiles['source'], sDims, bCrop)
+			# If additional dimensions were requested, and generation hasn't
+			#	been deferred to the worker, they're resized and uploaded
+			#	in a pipeline below once the record exists
+			if lThumbnails and not self._conf['async_thumbnails']:
+				bResize = True
 
 		# Else, it's a regular file
 		else:
@@ -771,16 +996,14 @@ class Blog(Service):
 		try:
 			if dImage:
 				req['data']['image'] = dImage
-			req['data']['uploader'] = req['session']['user']['_id']
+			req['data']['uploader'] = sUID
 			oFile = Media(req['data'])
 		except ValueError as e:
 			return Services.Error(1001, e.args[0])
 
 		# Create the record
 		try:
-			if not oFile.create(
-				changes = { 'user': req['session']['user']['_id'] }
-			):
+			if not oFile.create(changes = { 'user': sUID }):
 
 				# Record failed to be created
 				return Services.Error(errors.DB_CREATE_FAILED)
@@ -789,33 +1012,110 @@ class Blog(Service):
 		except DuplicateException as e:
 			return Error(errors.DB_DUPLICATE)
 
+		# Generate the filename for each file generated in a single pass
+		dNames = Media.filenames(oFile.record())
+
 		# Init the urls
 		dURLs = {}
 
-		# Go through each file generated
-		for sRes in dFiles:
+		# Start the source upload right away, each save is a blocking
+		#	network round trip so the thumbnails stream in behind it
+		dFutures = {
+			_storage_pool.submit(
+				MediaStorage.save,
+				dNames['source'], dFiles['source'], oFile['mime']
+			): 'source'
+		}
+
+		# Results collected as uploads finish, (size, success) pairs
+		lDone = []
+
+		# If thumbnails are generated inline, pipeline them: each size is
+		#	resized, handed straight to an upload, then dropped, so only a
+		#	bounded window of resized buffers exists at once instead of
+		#	every size at the same time
+		if bResize:
+			try:
+				for sRes, sData in images.resize_iter(
+					dFiles['source'], lThumbnails
+				):
+
+					# If the window is full, wait for an upload to finish
+					#	and collect it before holding another buffer
+					while len(dFutures) >= _UPLOAD_WINDOW:
+						for oFuture in \
+							wait(dFutures, return_when = FIRST_COMPLETED)[0]:
+							lDone.append(
+								(dFutures.pop(oFuture), oFuture.result())
+							)
 
-			# Get the filename
-			sFilename = oFile.filename(sRes)
+					# Hand the buffer to the pool, the future keeps the
+					#	only reference so it's freed as soon as the save
+					#	returns
+					dFutures[_storage_pool.submit(
+						MediaStorage.save, dNames[sRes], sData, oFile['mime']
+					)] = sRes
+					del sData
+
+			# If the decode or a resize fails, the record already exists
+			#	and the source upload is in flight, so both have to be
+			#	rolled back. The header check only proves the file claims
+			#	to be an image, a corrupt body still fails here
+			except Exception as e:
 
-			# Create new object and upload it
-			if not MediaStorage.save(sFilename, dFiles[sRes], oFile['mime']):
+				# Let the uploads already in flight finish so we know what
+				#	needs deleting
+				lUploaded = [
+					dNames[dFutures[oFuture]] \
+					for oFuture in as_completed(dFutures) \
+					if oFuture.result()
+				]
+				lUploaded.extend([
+					dNames[sRes] for sRes, bOK in lDone if bOK
+				])
 
-				# Delete the file
+				# Delete the record
 				oFile.delete(changes = { 'user': users.SYSTEM_USER_ID })
 
-				# Delete each S3 file that was created
-				for sRes in dURLs:
-					MediaStorage.delete(oFile.filename(sRes))
+				# Delete whatever made it up in one batched request
+				MediaStorage.delete_many(lUploaded)
 
 				# Return the error
-				return Services.Error(
-					STORAGE_ISSUE,
-					MediaStorage.last_error()
+				return Error(
+					errors.DATA_FIELDS, [ [ 'base64', str(e.args) ] ]
 				)
 
-			# Store the URL
-			dURLs[sRes] = MediaStorage.url(sFilename)
+		# Collect whatever's still in flight
+		for oFuture in as_completed(dFutures):
+			lDone.append((dFutures[oFuture], oFuture.result()))
+
+		# Go through each upload result
+		bFailed = False
+		for sRes, bOK in lDone:
+
+			# If the upload failed, flag it, the rest already ran so keep
+			#	collecting the successes for cleanup
+			if not bOK:
+				bFailed = True
+
+			# Else, store the URL
+			else:
+				dURLs[sRes] = MediaStorage.url(dNames[sRes])
+
+		# If any upload failed
+		if bFailed:
+
+			# Delete the file
+			oFile.delete(changes = { 'user': users.SYSTEM_USER_ID })
+
+			# Delete whatever made it up in one batched request
+			MediaStorage.delete_many([ dNames[sRes] for sRes in dURLs ])
+
+			# Return the error
+			return Services.Error(
+				STORAGE_ISSUE,
+				MediaStorage.last_error()
+			)
 
 		# Get the raw info
 		dFile = oFile.record()
@@ -823,6 +1123,14 @@ class Blog(Service):
 		# Add the URLs to the photo
 		dFile['urls'] = dURLs
 
+		# If thumbnails were deferred, queue the job for the worker now that
+		#	the record and the source file exist, and tell the client which
+		#	sizes are still pending
+		if dImage and dImage['thumbnails'] and \
+			self._conf['async_thumbnails']:
+			self._redis.rpush(thumbnails.QUEUE_KEY, oFile['_id'])
+			dFile['urls']['_pending'] = dImage['thumbnails']
+
 		# Return the file
 		return Response(dFile)
 
@@ -840,7 +1148,7 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_media', access.DELETE)
+		self._verify(req['session'], 'blog_media', access.DELETE)
 
 		# If the ID is missing
 		if '_id' not in req['data']:
@@ -853,23 +1161,15 @@ class Blog(Service):
 				errors.DB_NO_RECORD, [ req['data']['_id'], 'media' ]
 			)
 
-		# Create a list of all the keys to delete off S3
-		lFilenames = []
-
-		# If it's an image
-		if 'image' in oFile and oFile['image']:
+		# Create the list of all the keys to delete off storage, source and
+		#	thumbnails in one pass with a single filename split
+		lFilenames = list(Media.filenames(oFile.record()).values())
 
-			# Generate keys for each thumbnail
-			for s in oFile['image']['thumbnails']:
-				lFilenames.append(oFile.filename(s))
-
-		# Add the main file
-		lFilenames.append(oFile.filename())
-
-		# Go through each key and delete the file
-		for s in lFilenames:
-			if not MediaStorage.delete(s):
-				return Error(STORAGE_ISSUE, MediaStorage.last_error())
+		# Delete every key in one batched request instead of a round trip
+		#	per file. The record is only removed once storage is clean, so
+		#	the DB delete isn't overlapped with this
+		if MediaStorage.delete_many(lFilenames):
+			return Error(STORAGE_ISSUE, MediaStorage.last_error())
 
 		# Delete the record and return the result
 		return Services.Response(
@@ -890,7 +1190,7 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_media', access.READ)
+		self._verify(req['session'], 'blog_media', access.READ)
 
 		# Init filter
 		dFilter = {}
@@ -902,10 +1202,19 @@ class Blog(Service):
 				int(req['data']['range'][1])
 			]
 
-		# If we have a filename
-		if 'filename' in req['data'] and req['data']['filename']:
+		# If we have a search term, use the full text index
+		if 'search' in req['data'] and req['data']['search']:
+			dFilter['search'] = str(req['data']['search'])
+
+		# Else, if we have a filename
+		elif 'filename' in req['data'] and req['data']['filename']:
 			dFilter['filename'] = str(req['data']['filename'])
 
+		# Else, if we have a filename prefix, pass it along so the search can
+		#	use an anchored, index friendly pattern
+		elif 'filename_prefix' in req['data'] and req['data']['filename_prefix']:
+			dFilter['filename_prefix'] = str(req['data']['filename_prefix'])
+
 		# If we have a 'mine' filter
 		if 'mine' in req['data']:
 			dFilter['mine'] = req['session']['user']['_id']
@@ -914,23 +1223,36 @@ class Blog(Service):
 		if 'images_only' in req['data'] and req['data']['images_only']:
 			dFilter['images_only'] = True
 
+		# If specific fields were requested, make sure the ones we need to
+		#	generate the URLs are always included
+		if 'fields' in req['data'] and req['data']['fields']:
+			dFilter['fields'] = list(set(req['data']['fields']) | {
+				'_id', 'filename'
+			})
+
 		# If there's no filter
 		if not dFilter:
 			return Error(errors.DATA_FIELDS, [ [ 'range', 'missing' ] ])
 
+		# Pass along pagination if it was sent
+		if 'limit' in req['data']:
+			dFilter['limit'] = int(req['data']['limit'])
+		if 'offset' in req['data']:
+			dFilter['offset'] = int(req['data']['offset'])
+
 		# Get the records
-		lRecords = Media.search(dFilter)
+		try:
+			lRecords = Media.search(dFilter)
+		except ValueError as e:
+			return Error(errors.DATA_FIELDS, [ [ 'fields', 'invalid' ] ])
 
-		# Go through each and add the URLs
+		# Go through each and add the URLs, generating every filename for the
+		#	record in a single pass
 		for d in lRecords:
-
-			# Init the urls
-			d['urls'] = { 'source': MediaStorage.url(Media._filename(d)) }
-
-			# If we have an image, and we have thumbnails
-			if 'image' in d and d['image'] and d['image']['thumbnails']:
-				for s in d['image']['thumbnails']:
-					d['urls'][s] = MediaStorage.url(Media._filename(d, s))
+			d['urls'] = {
+				sRes: MediaStorage.url(sFile) \
+				for sRes, sFile in Media.filenames(d).items()
+			}
 
 		# Return the records
 		return Response(lRecords)
@@ -950,7 +1272,7 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_media', access.READ)
+		self._verify(req['session'], 'blog_media', access.READ)
 
 		# If the ID is missing
 		if '_id' not in req['data']:
@@ -963,16 +1285,44 @@ class Blog(Service):
 				errors.DB_NO_RECORD, [ req['data']['_id'], 'media' ]
 			)
 
+		# If the caller just wants locations, skip the download and encode
+		#	entirely, the files are public so the plain URLs serve the same
+		#	purpose as presigned GETs
+		if 'url_only' in req['data'] and req['data']['url_only']:
+			dFile['urls'] = {
+				sRes: MediaStorage.url(sFile) \
+				for sRes, sFile in Media.filenames(dFile).items()
+			}
+			return Services.Response(dFile)
+
 		# Generate the filaname
 		sFilename = Media._filename(dFile)
 
-		# Get the raw data
-		sRaw = MediaStorage.open(sFilename)
-		if sRaw is None:
+		# Stream the raw data from storage so we encode as it arrives instead
+		#	of holding the full file plus its base64 copy at once
+		oChunks = MediaStorage.open_stream(sFilename)
+		if oChunks is None:
 			return Error(STORAGE_ISSUE, MediaStorage.last_error())
 
-		# Convert it to base64 and add it to the data
-		dFile['base64'] = b64encode(sRaw)
+		# Feed base64 in 3-byte-aligned pieces so each chunk encodes cleanly
+		#	with no padding until the very end. The retry in open_stream only
+		#	covers the initial request, a timeout mid-download raises out of
+		#	the iterator
+		baB64 = bytearray()
+		sCarry = b''
+		try:
+			for sChunk in oChunks:
+				sData = sCarry + sChunk
+				iAligned = len(sData) - (len(sData) % 3)
+				baB64 += b64encode(sData[:iAligned])
+				sCarry = sData[iAligned:]
+		except Exception as e:
+			return Error(STORAGE_ISSUE, [ 'storage stream error', e.args ])
+		if sCarry:
+			baB64 += b64encode(sCarry)
+
+		# Add it to the data
+		dFile['base64'] = bytes(baB64)
 
 		# Return the file
 		return Services.Response(dFile)
@@ -991,7 +1341,7 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_media', access.UPDATE)
+		self._verify(req['session'], 'blog_media', access.UPDATE)
 
 		# Check for fields
 		try: evaluate(req['data'], [ '_id', 'size' ])
@@ -999,27 +1349,31 @@ class Blog(Service):
 			return Error(errors.DATA_FIELDS, e.args)
 
 		# Validate the size
-		if not self._dimensions.match(req['data']['size']):
+		if not self._dimensions.fullmatch(req['data']['size']):
 			return Error(errors.DATA_FIELDS, [ [ 'size', 'invalid' ] ])
 
-		# Find the record
-		oFile = Media.get(req['data']['_id'])
-		if not oFile:
+		# Find the record, only the columns the handler reads, no point
+		#	materializing the full row for a thumbnail change
+		dFile = Media.get(
+			req['data']['_id'],
+			raw = [ '_id', 'filename', 'mime', 'image' ]
+		)
+		if not dFile:
 			return Error(errors.DB_NO_RECORD, [ req['data']['_id'], 'media' ])
 
 		# If the file is not an image
-		if 'image' not in oFile or not oFile['image']:
+		if not dFile['image']:
 			return Error(NOT_AN_IMAGE, req['data']['_id'])
 
 		# If the thumbnail already exists
-		if req['data']['size'] in oFile['image']['thumbnails']:
+		if req['data']['size'] in dFile['image']['thumbnails']:
 			return Error(
 				errors.DB_DUPLICATE,
 				[ req['data']['_id'], req['data']['size'], 'media_thumbnail' ]
 			)
 
 		# Fetch the raw data
-		sImage = MediaStorage.open(oFile.filename())
+		sImage = MediaStorage.open(Media._filename(dFile))
 		if not sImage:
 			return Error(STORAGE_ISSUE, MediaStorage.last_error())
 
@@ -1031,27 +1385,22 @@ class Blog(Service):
 		sThumbnails = Image.resize(sImage, sDims, bCrop)
 
 		# Generate the filename
-		sFilename = oFile.filename(req['data']['size'])
+		sFilename = Media._filename(dFile, req['data']['size'])
 
 		# Store it
-		if not MediaStorage.save(sFilename, sThumbnails, oFile['mime']):
+		if not MediaStorage.save(sFilename, sThumbnails, dFile['mime']):
 
 			# If it failed, return a standard storage error, plus the error from
 			#	the specific storage engine
 			return Error(STORAGE_ISSUE, MediaStorage.last_error())
 
-		# Update the thumbnails
-		dImage = clone(oFile['image'])
-		dImage['thumbnails'].append(req['data']['size'])
-
-		# Set the new image in the record
-		oFile['image'] = dImage
-
-		# Save the record and store the result
-		bRes = oFile.save(changes = {'user': req['session']['user']['_id']})
-
-		# If we failed to save the record
-		if not bRes:
+		# Append the size to the thumbnails in place on the server, no copy
+		#	and rewrite of the whole image column
+		if not Media.thumbnail_add(
+			req['data']['_id'],
+			req['data']['size'],
+			req['session']['user']['_id']
+		):
 			return Error(errors.DB_UPDATE_FAILED)
 
 		# Return the new URL
@@ -1073,7 +1422,7 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_media', access.UPDATE)
+		self._verify(req['session'], 'blog_media', access.UPDATE)
 
 		# Check for fields
 		try: evaluate(req['data'], [ '_id', 'size' ])
@@ -1081,46 +1430,238 @@ class Blog(Service):
 			return Error(errors.DATA_FIELDS, e.args)
 
 		# Validate the size
-		if not self._dimensions.match(req['data']['size']):
+		if not self._dimensions.fullmatch(req['data']['size']):
 			return Error(errors.DATA_FIELDS, [ [ 'size', 'invalid' ] ])
 
-		# Find the record
-		oFile = Media.get(req['data']['_id'])
-		if not oFile:
+		# Find the record, only the columns the handler reads, no point
+		#	materializing the full row for a thumbnail change
+		dFile = Media.get(
+			req['data']['_id'],
+			raw = [ '_id', 'filename', 'image' ]
+		)
+		if not dFile:
 			return Error(errors.DB_NO_RECORD, [ req['data']['_id'], 'media' ])
 
 		# If the file is not an image
-		if 'image' not in oFile or not oFile['image']:
+		if not dFile['image']:
 			return Error(NOT_AN_IMAGE, req['data']['_id'])
 
 		# If the thumbnail doesn't exist
-		if req['data']['size'] not in oFile['image']['thumbnails']:
+		if req['data']['size'] not in dFile['image']['thumbnails']:
 			return Response(False)
 
 		# Delete it
-		if not MediaStorage.delete(oFile.filename(req['data']['size'])):
+		if not MediaStorage.delete(
+			Media._filename(dFile, req['data']['size'])
+		):
 
 			# If it failed, return a standard storage error, plus the error from
 			#	the specific storage engine
 			return Error(STORAGE_ISSUE, MediaStorage.last_error())
 
-		# Update the thumbnails in the image section
-		dImage = clone(oFile['image'])
-		dImage['thumbnails'].remove(req['data']['size'])
-
-		# Set the new image in the record
-		oFile['image'] = dImage
-
-		# Save the record and store the result
-		bRes = oFile.save(changes = {'user': req['session']['user']['_id']})
-
-		# If we failed to save the record
-		if not bRes:
+		# Remove the size from the thumbnails in place on the server, no copy
+		#	and rewrite of the whole image column
+		if not Media.thumbnail_remove(
+			req['data']['_id'],
+			req['data']['size'],
+			req['session']['user']['_id']
+		):
 			return Error(errors.DB_UPDATE_FAILED)
 
 		# Return success
 		return Response(True)
 
+	def admin_media_upload_create(self, req: dict) -> Response:
+		"""Media Upload create
+
+		Starts a direct upload session: returns a presigned URL the client \
+		PUTs the file to, so the bytes never pass through the service
+
+		Arguments:
+			req (dict): The request details, which can include 'data', \
+				'environment', and 'session'
+
+		Returns:
+			Services.Response
+		"""
+
+		# Make sure the user is signed in and has access
+		self._verify(req['session'], 'blog_media', access.CREATE)
+
+		# Check minimum fields
+		try: evaluate(req['data'], [ 'filename' ])
+		except ValueError as e:
+			return Error(
+				errors.DATA_FIELDS, [ [ s, 'missing' ] for s in e.args ]
+			)
+
+		# Guess the mime from the filename
+		sFilename = req['data']['filename']
+		tMime = mimetypes.guess_type(sFilename)
+		sMime = tMime[0] and tMime[0] or 'application/octet-stream'
+
+		# If thumbnails were requested, validate them now so the commit
+		#	can't fail on bad sizes
+		lThumbnails = []
+		if 'thumbnails' in req['data']:
+			lErrors = self._thumbnail_errors(req['data']['thumbnails'])
+			if lErrors:
+				return Error(errors.DATA_FIELDS, lErrors)
+			lThumbnails = req['data']['thumbnails']
+
+		# Generate the session ID and the temporary key the client uploads
+		#	to
+		sSession = str(uuid4())
+		sKey = 'upload/%s/%s' % (sSession, sFilename)
+
+		# Store the session so the commit can verify and finish it
+		self._redis.set(
+			'blog:upload:%s' % sSession,
+			jsonb.encode({
+				'filename': sFilename,
+				'key': sKey,
+				'mime': sMime,
+				'thumbnails': lThumbnails,
+				'user': req['session']['user']['_id']
+			}),
+			ex = 3600
+		)
+
+		# Track the temporary key so the worker sweeps it if the client
+		#	never commits, the session expiring doesn't remove the bytes
+		#	the client PUT
+		self._redis.zadd(
+			thumbnails.UPLOADS_KEY, { sKey: int(time()) + 3600 }
+		)
+
+		# Return the session and the URL to PUT the file to
+		return Response({
+			'session': sSession,
+			'url': MediaStorage.presign_put(sKey, sMime, 3600)
+		})
+
+	def admin_media_upload_update(self, req: dict) -> Response:
+		"""Media Upload update
+
+		Commits a direct upload session: verifies the file landed on \
+		storage, creates the media record from its metadata, and moves the \
+		bytes to their final key server side
+
+		Arguments:
+			req (dict): The request details, which can include 'data', \
+				'environment', and 'session'
+
+		Returns:
+			Services.Response
+		"""
+
+		# Make sure the user is signed in and has access
+		self._verify(req['session'], 'blog_media', access.CREATE)
+
+		# Check minimum fields
+		try: evaluate(req['data'], [ 'session' ])
+		except ValueError as e:
+			return Error(
+				errors.DATA_FIELDS, [ [ s, 'missing' ] for s in e.args ]
+			)
+
+		# Fetch the session
+		sCache = self._redis.get('blog:upload:%s' % req['data']['session'])
+		if not sCache:
+			return Error(
+				errors.DB_NO_RECORD, [ req['data']['session'], 'upload' ]
+			)
+		dSession = jsonb.decode(sCache)
+
+		# Make sure the file actually landed, a HEAD, not a download
+		dHead = MediaStorage.head(dSession['key'])
+		if not dHead:
+			return Error(STORAGE_ISSUE, MediaStorage.last_error())
+
+		# Init the record data
+		dData = {
+			'filename': dSession['filename'],
+			'mime': dHead['mime'] or dSession['mime'],
+			'length': dHead['length'],
+			'uploader': dSession['user']
+		}
+
+		# Get the filename extension, no dot means no extension
+		sExt = '.' in dSession['filename'] and \
+			dSession['filename'].rpartition('.')[2].lower() or ''
+
+		# If the file is an image, stream just enough off storage to parse
+		#	the header, most files need one chunk but JPEGs can bury the
+		#	frame header behind large metadata blocks
+		if sExt in _IMAGE_EXTS:
+			oChunks = MediaStorage.open_stream(dSession['key'])
+			if oChunks is None:
+				return Error(STORAGE_ISSUE, MediaStorage.last_error())
+			sData = b''
+			dInfo = None
+			try:
+				for sChunk in oChunks:
+					sData += sChunk
+
+					# Try the parse on what we have so far, stopping at the
+					#	cap so a corrupt file can't pull the whole object
+					try:
+						dInfo = images.info_quick(sData)
+						break
+					except Exception:
+						if len(sData) >= _INFO_MAX_BYTES:
+							break
+			except Exception as e:
+				return Error(STORAGE_ISSUE, [ 'storage stream error', e.args ])
+			if dInfo is None:
+				return Error(
+					errors.DATA_FIELDS, [ [ 'session', 'unreadable image' ] ]
+				)
+			dData['mime'] = dInfo['mime'] or dData['mime']
+			dData['image'] = {
+				'resolution': dInfo['resolution'],
+				'thumbnails': dSession['thumbnails']
+			}
+
+		# Create an instance to validate the data
+		try:
+			oFile = Media(dData)
+		except ValueError as e:
+			return Services.Error(1001, e.args[0])
+
+		# Create the record
+		try:
+			if not oFile.create(changes = { 'user': dSession['user'] }):
+				return Services.Error(errors.DB_CREATE_FAILED)
+		except DuplicateException as e:
+			return Error(errors.DB_DUPLICATE)
+
+		# Move the uploaded bytes to their final key server side
+		sFinal = oFile.filename()
+		if not MediaStorage.copy(dSession['key'], sFinal):
+			oFile.delete(changes = { 'user': users.SYSTEM_USER_ID })
+			return Services.Error(STORAGE_ISSUE, MediaStorage.last_error())
+
+		# Clean up the temporary key, the session, and the sweep entry,
+		#	best effort
+		MediaStorage.delete(dSession['key'])
+		self._redis.delete('blog:upload:%s' % req['data']['session'])
+		self._redis.zrem(thumbnails.UPLOADS_KEY, dSession['key'])
+
+		# Get the raw info and add the URL
+		dFile = oFile.record()
+		dFile['urls'] = { 'source': MediaStorage.url(sFinal) }
+
+		# If thumbnails were requested, hand them to the worker. The service
+		#	never downloaded the file, generating them here would defeat the
+		#	point of the direct upload
+		if 'image' in dData and dSession['thumbnails']:
+			self._redis.rpush(thumbnails.QUEUE_KEY, oFile['_id'])
+			dFile['urls']['_pending'] = dSession['thumbnails']
+
+		# Return the file
+		return Response(dFile)
+
 	def admin_media_url_read(self, req: dict) -> Response:
 		"""Media URL read
 
@@ -1135,7 +1676,7 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_media', access.READ)
+		self._verify(req['session'], 'blog_media', access.READ)
 
 		# If the ID is missing
 		if '_id' not in req['data']:
@@ -1189,7 +1730,7 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_post', access.CREATE)
+		self._verify(req['session'], 'blog_post', access.CREATE)
 
 		# Make sure we have locales at minimum
 		if 'locales' not in req['data']:
@@ -1205,13 +1746,9 @@ class Blog(Service):
 					[ req['data']['locales'][k]['slug'], 'slug' ]
 				)
 
-			# Check for the locale
-			oResponse = Services.read('mouth', 'locale/exists', { 'data': {
-				'_id': k
-			}})
-
-			# If it doesn't exist on mouth
-			if not oResponse.data:
+			# If the locale doesn't exist on mouth, checked through the
+			#	in-process cache
+			if not self._locale_exists(k):
 				return Error(
 					errors.DB_NO_RECORD, [ k, 'locale' ]
 				)
@@ -1222,22 +1759,24 @@ class Blog(Service):
 			# Readability
 			lCats = req['data']['categories']
 
-			# Check the values are unique
-			if len(set(lCats)) != len(lCats):
-				return Error(
-					errors.DATA_FIELDS, [ [ 'categories', 'not unique']]
-				)
+			# Check the values are unique while building the set used for
+			#	the existence check
+			sCats = set()
+			for s in lCats:
+				if s in sCats:
+					return Error(
+						errors.DATA_FIELDS, [ [ 'categories', 'not unique']]
+					)
+				sCats.add(s)
 
-			# Get all the IDs
-			lRecords = [ d['_id'] for d in Category.get(
-				lCats, raw = [ '_id' ]
-			) ]
+			# Find out which IDs actually exist in one column-only query
+			sFound = Category.ids_exist(lCats)
 
-			# If the counts don't match
-			if len(lRecords) != len(lCats):
+			# If any are missing
+			if len(sFound) != len(sCats):
 				return Error(
 					errors.DB_NO_RECORD,
-					[ [ c for c in lCats if c not in lRecords ], 'category' ]
+					[ list(sCats - sFound), 'category' ]
 				)
 
 		# Test the values by making the raw post instance
@@ -1272,7 +1811,7 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_post', access.DELETE)
+		self._verify(req['session'], 'blog_post', access.DELETE)
 
 		# If the ID is missing
 		if '_id' not in req['data']:
@@ -1347,7 +1886,7 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_publish', access.UPDATE)
+		self._verify(req['session'], 'blog_publish', access.UPDATE)
 
 		# If the ID is missing
 		if '_id' not in req['data']:
@@ -1514,11 +2053,12 @@ class Blog(Service):
 				# If we have categories
 				if oRaw['categories']:
 
-					# Extend the set for each one found in the raw data
-					lCategories.extend([ PostCategory({
-						'_slug': dLocale['slug'],
-						'_category': s
-					}) for s in oRaw['categories'] ])
+					# Extend the set for each one found in the raw data, the
+					#	rows go straight to a raw insert so there's no need
+					#	to build full records
+					lCategories.extend([
+						(dLocale['slug'], s) for s in oRaw['categories']
+					])
 
 					# Add them to the locale for regenerating
 					try:
@@ -1530,10 +2070,9 @@ class Blog(Service):
 				if dLocale['tags']:
 
 					# Extend the tags for each one found in the raw data
-					lTags.extend([ PostTag({
-						'_slug': dLocale['slug'],
-						'tag': s
-					}) for s in dLocale['tags'] ])
+					lTags.extend([
+						(dLocale['slug'], s) for s in dLocale['tags']
+					])
 
 					# Add them to the locale for regenerating
 					try:
@@ -1550,13 +2089,13 @@ class Blog(Service):
 			# Create the posts
 			Post.create_many(lPosts)
 
-			# If we have categories, create them
+			# If we have categories, create them in one raw insert
 			if lCategories:
-				PostCategory.create_many(lCategories)
+				PostCategory.create_raw(lCategories)
 
-			# If we have tags, create them
+			# If we have tags, create them in one raw insert
 			if lTags:
-				PostTag.create_many(lTags)
+				PostTag.create_raw(lTags)
 
 			# Add each post to the cache
 			for d in lPosts:
@@ -1609,14 +2148,13 @@ class Blog(Service):
 						dLocalesCategories[oPost['_locale']] = set(lCategories)
 
 					# And add the new ones (if there are any)
-					lNewCats = [ PostCategory({
-						'_slug': dPost['_slug'],
-						'_category': s
-					}) for s in oRaw['categories'] ]
+					lNewCats = [
+						(dPost['_slug'], s) for s in oRaw['categories']
+					]
 					if lNewCats:
 
-						# Insert the new categories
-						PostCategory.create_many(lNewCats)
+						# Insert the new categories in one raw insert
+						PostCategory.create_raw(lNewCats)
 
 						# Add the new categories to the locale for regenerating
 						try:
@@ -1643,14 +2181,13 @@ class Blog(Service):
 						dLocalesTags[oPost['_locale']] = set(lTags)
 
 					# And add the new ones (if there are any)
-					lNewTags = [ PostTag({
-						'_slug': dPost['_slug'],
-						'tag': s
-					}) for s in dLocale['tags'] ]
+					lNewTags = [
+						(dPost['_slug'], s) for s in dLocale['tags']
+					]
 					if lNewTags:
 
-						# Insert the new tags
-						PostTag.create_many(lNewTags)
+						# Insert the new tags in one raw insert
+						PostTag.create_raw(lNewTags)
 
 						# Add the new tags to the locale for regenerating
 						try:
@@ -1728,7 +2265,7 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_post', access.READ)
+		self._verify(req['session'], 'blog_post', access.READ)
 
 		# If the ID is missing
 		if '_id' not in req['data']:
@@ -1759,7 +2296,7 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_post', access.READ)
+		self._verify(req['session'], 'blog_post', access.READ)
 
 		# Fetch all the raw posts that have never been published, or whose
 		#	last updated time is newer than the last published time, and return
@@ -1782,7 +2319,7 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_post', access.UPDATE)
+		self._verify(req['session'], 'blog_post', access.UPDATE)
 
 		# Make sure we have the ID
 		if '_id' not in req['data']:
@@ -1807,22 +2344,24 @@ class Blog(Service):
 			# If we have any
 			if lCats:
 
-				# Check the values are unique
-				if len(set(lCats)) != len(lCats):
-					return Error(
-						errors.DATA_FIELDS, [ [ 'categories', 'not unique']]
-					)
+				# Check the values are unique while building the set used
+				#	for the existence check
+				sCats = set()
+				for s in lCats:
+					if s in sCats:
+						return Error(
+							errors.DATA_FIELDS, [ [ 'categories', 'not unique']]
+						)
+					sCats.add(s)
 
-				# Get all the IDs
-				lRecords = [ d['_id'] for d in Category.get(
-					lCats, raw = [ '_id' ]
-				) ]
+				# Find out which IDs actually exist in one column-only query
+				sFound = Category.ids_exist(lCats)
 
-				# If the counts don't match
-				if len(lRecords) != len(lCats):
+				# If any are missing
+				if len(sFound) != len(sCats):
 					return Error(
 						errors.DB_NO_RECORD,
-						[ [ c for c in lCats if c not in lRecords ], 'category' ]
+						[ list(sCats - sFound), 'category' ]
 					)
 
 			# Set categories
@@ -1893,7 +2432,7 @@ class Blog(Service):
 		"""
 
 		# Make sure the user is signed in and has access
-		access.verify(req['session'], 'blog_post', access.READ)
+		self._verify(req['session'], 'blog_post', access.READ)
 
 		# Init the dict of raw to locales
 		dRaw = {}
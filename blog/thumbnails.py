@@ -0,0 +1,172 @@
+# coding=utf8
+""" Blog Thumbnails
+
+Worker that generates and uploads media thumbnails queued by the service, \
+so uploads don't pay the resize and upload cost on the request thread
+"""
+
+__author__		= "Chris Nasr"
+__version__		= "1.0.0"
+__copyright__	= "Ouroboros Coding Inc."
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-08-29"
+
+# Ouroboros imports
+from config import config
+from nredis import nr
+
+# Python imports
+from sys import stderr
+from time import time
+from traceback import format_exc
+
+# Module imports
+from blog import images
+from blog.records import Media
+
+# Figure out storage system
+_storage_type = config.blog.storage('S3')
+if _storage_type == 'S3':
+	from blog.media.s3 import MediaStorage
+else:
+	raise ValueError('Storage type invalid', _storage_type)
+
+# The queue the service pushes media IDs onto
+QUEUE_KEY = 'blog:thumbnails'
+
+# The channel pattern completion messages are published on
+DONE_KEY = 'blog:thumbnail:done:%s'
+
+# Sorted set of temporary upload keys scored by session expiry, so the
+#	bytes a client PUT but never committed get swept off storage
+UPLOADS_KEY = 'blog:upload:pending'
+
+def _process(redis, _id: str) -> None:
+	"""Process (Protected)
+
+	Generates and uploads every thumbnail listed on a single media record
+
+	Arguments:
+		redis (StrictRedis): The redis instance to publish completion on
+		_id (str): The ID of the media record to process
+
+	Returns:
+		None
+	"""
+
+	# Fetch the record, it might have been deleted since it was queued
+	dFile = Media.get(_id, raw = True)
+	if not dFile or not dFile['image'] or \
+		not dFile['image']['thumbnails']:
+		return
+
+	# Fetch the source off storage
+	sSource = MediaStorage.open(Media._filename(dFile))
+	if sSource is None:
+		print(
+			'thumbnails: %s source missing: %s' % (
+				_id, MediaStorage.last_error()
+			),
+			file = stderr
+		)
+		return
+
+	# Decode the source once and generate every requested size
+	dResized = images.resize_many(sSource, dFile['image']['thumbnails'])
+
+	# Generate the storage filenames in one pass
+	dNames = Media.filenames(dFile)
+
+	# Upload each thumbnail
+	for sRes, sData in dResized.items():
+		if not MediaStorage.save(dNames[sRes], sData, dFile['mime']):
+			print(
+				'thumbnails: %s failed to save %s: %s' % (
+					_id, sRes, MediaStorage.last_error()
+				),
+				file = stderr
+			)
+
+	# Let any listeners know the thumbnails are available
+	redis.publish(DONE_KEY % _id, _id)
+
+def _sweep_uploads(redis) -> None:
+	"""Sweep Uploads (Protected)
+
+	Deletes the temporary objects of direct upload sessions that expired \
+	without being committed, the Redis session going away doesn't remove \
+	the bytes the client PUT
+
+	Arguments:
+		redis (StrictRedis): The redis instance holding the pending set
+
+	Returns:
+		None
+	"""
+
+	# Fetch every key whose session has expired
+	lExpired = redis.zrangebyscore(UPLOADS_KEY, '-inf', time())
+	if not lExpired:
+		return
+
+	# Decode any bytes
+	lKeys = [
+		isinstance(s, bytes) and s.decode() or s for s in lExpired
+	]
+
+	# Delete the whole batch in one request, keys already removed by a
+	#	commit are quietly ignored by storage
+	lFailed = MediaStorage.delete_many(lKeys)
+
+	# Drop what went through from the set, failures stay for the next pass
+	lRemove = [ s for s in lKeys if s not in lFailed ]
+	if lRemove:
+		redis.zrem(UPLOADS_KEY, *lRemove)
+
+def run() -> int:
+	"""Run
+
+	Blocks popping media IDs off the queue and generating their thumbnails \
+	until the process is stopped
+
+	Returns:
+		uint
+	"""
+
+	# Create a connection to Redis
+	oRedis = nr(config.blog.redis_host('blog'))
+
+	# Loop forever
+	while True:
+
+		# Block until a job shows up, waking periodically so the process
+		#	can be stopped cleanly
+		lJob = oRedis.blpop(QUEUE_KEY, timeout = 30)
+
+		# Sweep any abandoned direct uploads past their session expiry, a
+		#	bad sweep shouldn't kill the worker
+		try:
+			_sweep_uploads(oRedis)
+		except Exception:
+			print(
+				'thumbnails: upload sweep raised\n%s' % format_exc(),
+				file = stderr
+			)
+
+		# If the pop timed out, just loop back around
+		if not lJob:
+			continue
+
+		# Decode the ID
+		sID = lJob[1]
+		if isinstance(sID, bytes):
+			sID = sID.decode()
+
+		# Process the record, one bad job shouldn't kill the worker
+		try:
+			_process(oRedis, sID)
+		except Exception:
+			print(
+				'thumbnails: %s raised\n%s' % (sID, format_exc()),
+				file = stderr
+			)